@@ -0,0 +1,193 @@
+from __future__ import absolute_import, unicode_literals, division
+import logging
+import random
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+
+from demorphy.cache import lrucache, shardedlrucache
+
+logger = logging.getLogger('demorphy.bench')
+
+
+class LockedLRUCache(object):
+    """lrucache behind a single lock, the thread safe baseline"""
+
+    def __init__(self, size):
+        self.cache = lrucache(size)
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.cache.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            self.cache[key] = value
+
+
+class _Node(object):
+    pass
+
+
+class LinkedLRUCache(object):
+    """
+    Hit and insert path of the former lrucache, a circular list of preallocated nodes moved to the front on every hit
+    """
+
+    def __init__(self, size):
+        self.table = {}
+        self.head = _Node()
+        self.head.next = self.head.prev = self.head
+        self.head.empty = True
+        for i in range(size - 1):
+            node = _Node()
+            node.empty = True
+            node.next = self.head
+            node.prev = self.head.prev
+            self.head.prev.next = node
+            self.head.prev = node
+
+    def mtf(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = self.head.prev
+        node.next = self.head.prev.next
+        node.next.prev = node
+        node.prev.next = node
+
+    def __getitem__(self, key):
+        node = self.table[key]
+        self.mtf(node)
+        self.head = node
+        return node.value
+
+    def get(self, key, default=None):
+        if key not in self.table:
+            return default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        if key in self.table:
+            node = self.table[key]
+            node.value = value
+            self.mtf(node)
+            self.head = node
+            return
+        node = self.head.prev
+        if not node.empty:
+            del self.table[node.key]
+        node.empty = False
+        node.key = key
+        node.value = value
+        self.table[key] = node
+        self.head = node
+
+
+def make_keys(count=200000, vocabulary=20000, seed=0):
+    """
+    Word-like keys with a Zipfian frequency, as tokens of a text
+    """
+    rnd = random.Random(seed)
+    words = [u"wort%d" % i for i in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return rnd.choices(words, weights, k=count)
+
+
+def run_threads(cache, keys, thread_count):
+    """
+    Look up and fill the cache from thread_count threads, return operations per second
+    """
+    shares = [keys[i::thread_count] for i in range(thread_count)]
+
+    def _work(share):
+        for key in share:
+            if cache.get(key) is None:
+                cache[key] = key
+
+    threads = [threading.Thread(target=_work, args=(share,)) for share in shares]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(keys) / (time.time() - start)
+
+
+def bench_caches(keys, size=2000, thread_counts=(1, 4, 16), repeats=3):
+    logger.info("    GIL %s", "enabled" if getattr(sys, "_is_gil_enabled", lambda: True)() else "disabled")
+    logger.info("    lrucache, 1 thread, no lock: %0.0f ops/sec",
+                max(run_threads(lrucache(size), keys, 1) for x in range(repeats)))
+    for thread_count in thread_counts:
+        locked = max(run_threads(LockedLRUCache(size), keys, thread_count) for x in range(repeats))
+        sharded = max(run_threads(shardedlrucache(size), keys, thread_count) for x in range(repeats))
+        logger.info("    %2d threads: lrucache + lock %0.0f ops/sec, shardedlrucache %0.0f ops/sec", thread_count, locked, sharded)
+
+
+def hit_latency(cache, size, repeats=5, number=200000):
+    """
+    Nanoseconds per cache hit, on a full cache
+    """
+    for i in range(size):
+        cache[i] = i
+    keys = list(range(0, size, 7)) * (number // len(range(0, size, 7)) + 1)
+    keys = keys[:number]
+
+    def _hits():
+        for key in keys:
+            cache[key]
+
+    return min(timeit.repeat(_hits, number=1, repeat=repeats)) / number * 1e9
+
+
+def insert_latency(cache, size, repeats=5, number=200000):
+    """
+    Nanoseconds per insert of a new key into a full cache, including the eviction
+    """
+    for i in range(size):
+        cache[i] = i
+    keys = range(size, size + number * repeats)
+    position = [0]
+
+    def _inserts():
+        start = position[0]
+        for key in keys[start:start + number]:
+            cache[key] = key
+        position[0] += number
+
+    return min(timeit.repeat(_inserts, number=1, repeat=repeats)) / number * 1e9
+
+
+def entry_memory(make_cache, size=100000):
+    """
+    Bytes allocated per entry of a full cache, besides keys and values
+    """
+    keys = list(range(size))
+    tracemalloc.start()
+    cache = make_cache(size)
+    for key in keys:
+        cache[key] = None
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return float(allocated) / size
+
+
+def bench_lru(size=2000):
+    for name, make_cache in (("linked nodes", LinkedLRUCache), ("lrucache", lrucache)):
+        logger.info("    %s: hit %0.0f ns, insert %0.0f ns, %0.0f bytes/entry", name,
+                    hit_latency(make_cache(size), size), insert_latency(make_cache(size), size),
+                    entry_memory(make_cache))
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("LRU")
+    bench_lru()
+    logger.info("Cache")
+    bench_caches(make_keys())
+
+
+if __name__ == "__main__":
+    main()
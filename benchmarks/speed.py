@@ -2,8 +2,13 @@ from __future__ import absolute_import, unicode_literals, division
 import codecs
 import datetime
 import functools
+import json
 import logging
 import os
+import random
+import subprocess
+import sys
+import threading
 
 import time
 import timeit
@@ -23,7 +28,7 @@ def measure_indiv(func, inner_iterations=1, repeats=5):
         times.append(time.time() - start)
 
     gc.enable()
-    return inner_iterations/min(times) 
+    return inner_iterations/min(times)
 
 def load_data(path):
     words = []
@@ -33,9 +38,183 @@ def load_data(path):
             words.append(word)
     return words
 
-def bench_tags(words):
+def bench_tags(words, repeats=5):
     def _run():
         for word in words:
             analyzer.analyze(word)
     measure = functools.partial(measure_indiv, repeats=repeats)
     logger.info("    analyze(w): %0.0f words/sec", measure(_run, len(words)))
+
+def bench_exact_lookup(words, repeats=5):
+    """
+    Compare looking up every word with char substitutes to trying the exact spelling first, as analyze does.
+    """
+    dictionary = analyzer.dictionary
+    char_substitutes = analyzer.char_substitutes
+
+    def _similar():
+        for word in words:
+            dictionary.find_similar_words(word, char_substitutes)
+
+    def _exact_first():
+        for word in words:
+            dictionary.find_paradigm_lemma_id(word) or dictionary.find_similar_words(word, char_substitutes)
+
+    measure = functools.partial(measure_indiv, repeats=repeats)
+    similar_speed = measure(_similar, len(words))
+    exact_speed = measure(_exact_first, len(words))
+    logger.info("    similar lookup: %0.0f words/sec", similar_speed)
+    logger.info("    exact first lookup: %0.0f words/sec", exact_speed)
+    logger.info("    saving: %0.2f usec/word", 1e6/similar_speed - 1e6/exact_speed)
+
+def bench_lemmatize(words, repeats=5):
+    """
+    Compare collecting lemmas of analyze results to lemmatize, which doesn't build analyses.
+    """
+    def _analyze():
+        for word in words:
+            set(result.lemma for result in analyzer.analyze(word))
+
+    def _lemmatize():
+        for word in words:
+            analyzer.lemmatize(word)
+
+    def _lemmatize_many():
+        analyzer.lemmatize_many(words)
+
+    measure = functools.partial(measure_indiv, repeats=repeats)
+    logger.info("    analyze(w) lemmas: %0.0f words/sec", measure(_analyze, len(words)))
+    logger.info("    lemmatize(w): %0.0f words/sec", measure(_lemmatize, len(words)))
+    logger.info("    lemmatize_many(words): %0.0f words/sec", measure(_lemmatize_many, len(words)))
+
+def noisy_words(words, count=10000, seed=0):
+    """
+    Unknown tokens like hashtags, URLs and typos, made by mutating the given words
+    """
+    rnd = random.Random(seed)
+    noisy = []
+    for x in range(count):
+        word = rnd.choice(words)
+        pos = rnd.randrange(len(word) + 1)
+        noisy.append(rnd.choice([u"#" + word, word + u".com", word[:pos] + u"x" + word[pos:], word[:pos] + u"q" + word[pos + 1:]]))
+    return noisy
+
+
+def bench_bloom(words, repeats=5):
+    """
+    Compare is_known and analyze on noisy input with and without the Bloom filter, report its memory and false positive rate.
+    is_known of known words is measured as well, the filter must not slow down hits.
+    """
+    bloom_analyzer = Analyzer(char_subs_allowed=True, bloom=True)
+    bloom_filter = bloom_analyzer.dictionary.bloom_filter
+    noisy = [word for word in noisy_words(words) if not analyzer.is_known(word)]
+    known = [word for word in words if analyzer.is_known(word)]
+
+    measure = functools.partial(measure_indiv, repeats=repeats)
+    for name, bench_analyzer in (("no filter", analyzer), ("Bloom filter", bloom_analyzer)):
+        def _is_known():
+            for word in noisy:
+                bench_analyzer.is_known(word)
+
+        def _analyze():
+            for word in noisy:
+                bench_analyzer.analyze(word)
+
+        def _is_known_hits():
+            for word in known:
+                bench_analyzer.is_known(word)
+
+        logger.info("    is_known(w), misses, %s: %0.0f words/sec", name, measure(_is_known, len(noisy)))
+        logger.info("    analyze(w), misses, %s: %0.0f words/sec", name, measure(_analyze, len(noisy)))
+        logger.info("    is_known(w), hits, %s: %0.0f words/sec", name, measure(_is_known_hits, len(known)))
+
+    false_positives = sum(1 for word in noisy if word in bloom_filter)
+    logger.info("    filter: %d keys, %d kB, %d hashes", bloom_filter.num_keys, bloom_filter.nbytes // 1024, bloom_filter.num_hashes)
+    logger.info("    false positive rate: %0.4f expected, %0.4f measured on %d misses",
+                bloom_filter.false_positive_rate, false_positives / max(len(noisy), 1), len(noisy))
+
+def bench_threads(words, thread_counts=(1, 2, 4, 8), repeats=3):
+    """
+    Analyze the words from several threads sharing one analyzer, each thread takes an equal share.
+    Total throughput grows with the number of threads only on free-threaded CPython builds, the GIL serializes the rest.
+    """
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    logger.info("    GIL %s", "enabled" if gil_enabled else "disabled")
+
+    for thread_count in thread_counts:
+        shares = [words[i::thread_count] for i in range(thread_count)]
+
+        def _run():
+            threads = [threading.Thread(target=lambda share=share: [analyzer.analyze(word) for word in share]) for share in shares]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        speed = measure_indiv(_run, len(words), repeats=repeats)
+        logger.info("    analyze(w), %d threads: %0.0f words/sec", thread_count, speed)
+
+
+#Run in a fresh interpreter, so that the memory of one loading mode doesn't leak into the other
+LOAD_SCRIPT = """
+import io, json, sys, time
+
+def memory_kb():
+    mem = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                mem[parts[0][:-1]] = int(parts[1])
+    return mem["Rss"], mem["Pss"], mem["Private_Clean"] + mem["Private_Dirty"]
+
+start = time.time()
+from demorphy import Analyzer
+analyzer = Analyzer(char_subs_allowed=True, mmap=%(mmap)r)
+startup = time.time() - start
+for line in io.open(sys.stdin.fileno(), encoding="utf-8"):
+    analyzer.analyze(line.rstrip("\\n"))
+rss, pss, private = memory_kb()
+print(json.dumps({"startup": startup, "rss": rss, "pss": pss, "private": private}))
+"""
+
+def bench_load(words=(), mmap=False):
+    """
+    Measure dictionary startup time and memory of a process in the given loading mode.
+    Words are analyzed after loading, so that the pages they touch are counted. They're passed on stdin, a corpus doesn't
+    fit into the command line.
+    """
+    script = LOAD_SCRIPT % {"mmap": mmap}
+    process = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    out, err = process.communicate(u"".join(u"%s\n" % word for word in words).encode("utf-8"))
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, "bench_load")
+    stats = json.loads(out.decode("utf-8"))
+    logger.info("    load(mmap=%s): %0.2f sec startup, %d kB RSS, %d kB PSS, %d kB private",
+                mmap, stats["startup"], stats["rss"], stats["pss"], stats["private"])
+    return stats
+
+
+def main(path=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    words = load_data(path) if path else []
+
+    logger.info("Dictionary loading")
+    bench_load(words, mmap=False)
+    bench_load(words, mmap=True)
+
+    if words:
+        logger.info("Lookup")
+        bench_exact_lookup(words)
+        logger.info("Analysis")
+        bench_tags(words)
+        logger.info("Lemmatization")
+        bench_lemmatize(words)
+        logger.info("Unknown words")
+        bench_bloom(words)
+        logger.info("Threads")
+        bench_threads(words)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
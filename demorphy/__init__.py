@@ -1,4 +1,4 @@
-__all__ = ["Analyzer"]
+__all__ = ["Analyzer", "AnalyzedBatch"]
 
-from demorphy.analyzer import Analyzer
+from demorphy.analyzer import Analyzer, AnalyzedBatch
 from demorphy.tagset import TagClass
@@ -2,40 +2,226 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import array
+import io
+import numbers
 import threading
 import os
 
-from demorphy.data import CHAR_SUBSTITUTES
-from demorphy.suffix_analyzer import SuffixAnalyzer
+from demorphy.cache import CacheInfo, CountingCache, PersistentCache, lrucache
+from demorphy.compound_analyzer import CompoundAnalyzer
+from demorphy.data import CHAR_SUBSTITUTES, frequent_words
+from demorphy.suffix_analyzer import SuffixAnalyzer, lookup_paradigm
 from demorphy  import morph_dict
 from demorphy.tagset import ParsedResult
 
 
+class AnalyzedBatch(object):
+    """
+    Analyses of a batch of tokens. Each distinct surface form (type) is analyzed once, tokens refer to their type.
+    Behaves like a list holding one list of ParsedResult objects per token, in input order.
+    """
+
+    __slots__ = ["types", "analyses", "token_types"]
+
+    def __init__(self, types, analyses, token_types):
+        """
+        Args:
+            types: list of distinct surface forms, in order of first occurence
+            analyses: list of ParsedResult lists, one per type
+            token_types: array of type indices, one per token
+        """
+        self.types = types
+        self.analyses = analyses
+        self.token_types = token_types
+
+    @property
+    def n_types(self):
+        return len(self.types)
+
+    @property
+    def n_tokens(self):
+        return len(self.token_types)
+
+    def __len__(self):
+        return len(self.token_types)
+
+    def __getitem__(self, token_index):
+        if isinstance(token_index, slice):
+            return [self.analyses[type_index] for type_index in self.token_types[token_index]]
+        return self.analyses[self.token_types[token_index]]
+
+    def __iter__(self):
+        analyses = self.analyses
+        for type_index in self.token_types:
+            yield analyses[type_index]
+
+    def tolist(self):
+        """
+        Nested list of analyses, one list per token. Tokens of the same type share the same list.
+        """
+        return list(self)
+
+    def __str__(self):
+        return "AnalyzedBatch(%d tokens, %d types)" % (self.n_tokens, self.n_types)
+
+    def __repr__(self):
+        return str(self)
+
+
 class Analyzer(object):
+    """
+    German morphological analyzer.
+    An Analyzer can be shared by threads, analyze and all other lookups may be called concurrently.
+    Loaded dictionary is read-only; interned results, decoded lemmas and compound splits are pooled per thread, so lookups
+    don't wait on a shared lock. Analysis cache and persistent cache are shared, their shards are locked separately.
+    Only the one time dictionary loading is serialized.
+    """
     PATH_ENV_VAR = "DEMORPHY_PATH"
     DEFAULT_SUBSTITUTES = CHAR_SUBSTITUTES
-    
+    DEFAULT_RESULT_POOL_SIZE = 20000
+    UNLIMITED_CACHE = "unlim"
+    #First line of cache snapshot files
+    SNAPSHOT_HEADER = u"#demorphy cache snapshot 1"
 
-    _lock = threading.RLock()
+    #Marks cache misses, None is a valid cached value
+    _MISSING = object()
 
-    def __init__(self, char_subs_allowed=True):
+    def __init__(self, char_subs_allowed=True, mmap=False, lazy=False, result_pool_size=DEFAULT_RESULT_POOL_SIZE, case_fold=False,
+                 compounds=True, bloom=False, cache=None, persistent_cache=None):
         """"
         Initialize Analyzer object by dictionary. Dictionary consists of dag, lemma list and paradigms list.
+        If compounds is True, unknown words are split into known words before falling back onto suffix analyzer.
+        If case_fold is True, words are also looked up with the case of their first letter swapped, e.g. haus -> Haus for
+        lowercased text and Der -> der for sentence initial tokens.
+        If mmap is True, words dag is memory mapped and shared with other processes instead of being loaded into the heap.
+        If lazy is True, dictionary is loaded on the first lookup or by an explicit warmup() call.
+        If bloom is True, a Bloom filter over the words rejects most unknown words before the spelling variants are searched.
+        It's read from the data folder if it was built there, otherwise it's built while loading the dictionary.
+        Dictionary analyses are interned, the same (lemma id, paradigm id) pair returns the same ParsedResult object,
+        hence results must not be modified. result_pool_size bounds the number of interned results and decoded lemmas,
+        least recently used ones are evicted. Each thread has its own pools of this size.
+        0 or None disables interning.
+        cache caches analyze, is_known and lemmatize results per word: an integer is the size of an LRU cache, "unlim" is an
+        unbounded cache, None or 0 is no cache. Hits, misses and evictions are reported by cache_info().
+        persistent_cache is the path of a dbm file keeping raw analyses across runs, see PersistentCache. Words analyzed by
+        an earlier run skip the dictionary lookups. The file is emptied if the dictionary or the settings changed since.
+        Call close() or sync_cache() to write the last analyses into it.
         Examples:
             >>> from demorph import Analyzer
             >>> analyzer = Analyzer(char_subs_allowed=True)
+            >>> analyzer = Analyzer(char_subs_allowed=True, mmap=True)
+            >>> analyzer = Analyzer(char_subs_allowed=True, lazy=True)
+            >>> analyzer = Analyzer(char_subs_allowed=True, case_fold=True)
+            >>> analyzer = Analyzer(char_subs_allowed=True, cache=200)
+            >>> analyzer = Analyzer(char_subs_allowed=True, persistent_cache="/var/cache/demorphy/analyses")
+        """
+
+        self.char_subs_allowed = char_subs_allowed
+        self.mmap = mmap
+        self.case_fold = case_fold
+        self.compounds = compounds
+        self.bloom = bloom
+
+        self.dictionary = None
+        self.char_substitutes = None
+        self.compound_analyzer = None
+
+        self.extra_char_mappings = {u"ß":u"ss", u"ss":u"ß", u"ue":u"ü", u"oe":u"ö", u"ae":u"ä"}
+        spelling_mappings = dict(self.DEFAULT_SUBSTITUTES if char_subs_allowed else {}, **self.extra_char_mappings)
+        self.spelling_substitutes = morph_dict.Dictionary.compile_spelling_substitutes(spelling_mappings)
+
+        self.result_pool_size = result_pool_size
+        #Interning pools of each thread, lrucache isn't thread safe
+        self._local = threading.local()
+        #Required tags -> ids of paradigms having all of them. Only filled, a lost race computes the same set twice
+        self._paradigm_filters = {}
+        #Guards dictionary loading only
+        self._lock = threading.Lock()
+
+        if cache == self.UNLIMITED_CACHE:
+            self._cache = CountingCache()
+        elif cache:
+            self._cache = CountingCache(int(cache))
+        else:
+            self._cache = None
+
+        #Opened with the dictionary, its fingerprint is part of the file's
+        self.persistent_cache_path = persistent_cache
+        self._store = None
+
+        if not lazy:
+            self.warmup()
+
+    def warmup(self):
+        """
+        Load the dictionary if it's not loaded yet. Lazy analyzers do it on first use, servers can call it eagerly.
+        Initialization happens only once, even if several threads call it at the same time.
+        Returns:
+            Analyzer object itself
+        Examples:
+            >>> analyzer = Analyzer(char_subs_allowed=True, lazy=True).warmup()
         """
 
-        path = Analyzer.find_dictionary_path()
+        if self.dictionary is not None:
+            return self
 
         with self._lock:
-            self.dictionary = morph_dict.Dictionary(path)
+            if self.dictionary is None:
+                path = Analyzer.find_dictionary_path()
+                dictionary = morph_dict.Dictionary(path, mmap=self.mmap, bloom=self.bloom)
+                self.char_substitutes = dictionary.dafsa.compile_replaces(self.DEFAULT_SUBSTITUTES if self.char_subs_allowed else {})
+                self.compound_analyzer = CompoundAnalyzer(dictionary)
+                if self.persistent_cache_path is not None:
+                    self._store = PersistentCache(self.persistent_cache_path, self._fingerprint(dictionary))
+                #Published last, other threads check only this field
+                self.dictionary = dictionary
 
-        self.char_substitutes = self.dictionary.dafsa.compile_replaces(self.DEFAULT_SUBSTITUTES if char_subs_allowed else {})
+        return self
 
-        self.extra_char_mappings = {u"ß":u"ss", u"ss":u"ß", u"ue":u"ü", u"oe":u"ö"}
+    def _fingerprint(self, dictionary):
+        """
+        Identify the dictionary and the settings which change analyses, stamp of the persistent cache
+        """
+
+        substitutes = sorted(self.DEFAULT_SUBSTITUTES.items()) if self.char_subs_allowed else []
+        settings = u"subs=%s case_fold=%s compounds=%s" % (substitutes, self.case_fold, self.compounds)
+        return u"%s %s" % (dictionary.fingerprint(), settings)
+
+    def _pools(self):
+        """
+        Return pools of the current thread, create them on the first call of the thread
+        """
+
+        local = self._local
+        try:
+            local.result_pool
+        except AttributeError:
+            size = self.result_pool_size
+            local.result_pool = lrucache(size) if size else None
+            local.lemma_pool = lrucache(size) if size else None
+        return local
+
+    @property
+    def _result_pool(self):
+        return self._pools().result_pool
+
+    @property
+    def _lemma_pool(self):
+        return self._pools().lemma_pool
+
+    def iter_lexicon_raw(self, prefix=u""):
+        """
+        Iterate over all lexicon, by prefix on demand. Default is empty prefix i.e. all words
+        Args:
+            prefix: unicode string, default empty string
+        Yields:
+            (word, paradigm string, lemma) tuples
+        """
 
-        self.iter_lexicon_raw = self.dictionary.iter_lexicon
+        if self.dictionary is None:
+            self.warmup()
+        return self.dictionary.iter_lexicon(prefix)
 
     def analyze_by_dafsa(self, surface_form):
         """
@@ -52,15 +238,53 @@ class Analyzer(object):
              {'PTB_TAG': 'JJ', 'CATEGORY': 'ADJ', 'LEMMA': 'rot', 'ADDITIONAL_ATTRIBUTES': '<pred>', 'DEGREE': 'pos', 'STTS_TAG': 'ADJD'}]
         """
 
+        if self.dictionary is None:
+            self.warmup()
         para_lemma_id_list = self.dictionary.find_paradigm_lemma_id(surface_form)
-        para_lemma_list = [(self.dictionary.lookup_lemma(lemma_id), self.dictionary.lookup_paradigm(paradigm_id)) for (lemma_id, paradigm_id) in para_lemma_id_list]
-        return [ParsedResult(paradigm_str, lemma) for (lemma, paradigm_str) in para_lemma_list]
+        return [self._parsed_result(lemma_paradigm_id) for lemma_paradigm_id in para_lemma_id_list]
+
+    def _parsed_result(self, lemma_paradigm_id):
+        """
+        Return the interned ParsedResult of a (lemma id, paradigm id) pair, create it if it's not in the pool
+        """
 
-    def analyze_by_ending(self, surface_form):
+        try:
+            pool = self._local.result_pool
+        except AttributeError:
+            pool = self._pools().result_pool
+        if pool is not None:
+            try:
+                return pool[lemma_paradigm_id]
+            except KeyError:
+                pass
+
+        lemma_id, paradigm_id = lemma_paradigm_id
+        result = ParsedResult(self.dictionary.lookup_paradigm_features(paradigm_id), self.dictionary.lookup_lemma(lemma_id))
+        if pool is not None:
+            pool[lemma_paradigm_id] = result
+        return result
+
+    def _paradigm_filter(self, require):
+        """
+        Return ids of paradigms having all the required tags, None if nothing is required
+        """
+
+        if not require:
+            return None
+        require = frozenset(require)
+        para_ids = self._paradigm_filters.get(require)
+        if para_ids is None:
+            para_ids = self._paradigm_filters[require] = frozenset(self.dictionary.find_paradigm_ids(require))
+        return para_ids
+
+    def analyze_by_ending(self, surface_form, require=None):
         """
         Analyze word by its ending
+        If the suffix index was built, its guesses from the longest known ending cover all open word classes.
+        Otherwise, or if no ending is known, hand-written verb and participle endings of SuffixAnalyzer are used.
         Args:
             surface_form: Surface form, just as in lexicon googliert
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
         Returns:
             list of ParsedResult objects
         Raises:
@@ -71,16 +295,75 @@ class Analyzer(object):
              {'PTB_TAG': 'JJ', 'GUESSER': True, 'CATEGORY': 'ADJ', 'CASE': 'dat', 'LEMMA': 'googlend', 'STARKE': 'strong', 'DEGREE': 'pos', 'STTS_TAG': 'ADJA', 'NUMERUS': 'sing', 'GENDER': 'neut'}]
         """
 
-        lemma, para_list = SuffixAnalyzer.guess_word_by_suffix(surface_form)
-        return [ParsedResult(paradigm_str, lemma, guesser=True) for paradigm_str in para_list]
+        if self.dictionary is None:
+            self.warmup()
+        return [self._hydrate_guess(guess) for guess in self._ending_guesses(surface_form, require)]
+
+    def _ending_guesses(self, surface_form, require):
+        """
+        Raw analyses of analyze_by_ending, (lemma, paradigm id) pairs of the suffix index or (lemma, paradigm string) pairs of SuffixAnalyzer
+        """
+
+        para_filter = self._paradigm_filter(require)
+        guesses = self.dictionary.guess_paradigm_lemma(surface_form)
+        if guesses:
+            return [guess for guess in guesses if para_filter is None or guess[1] in para_filter]
+
+        lemma, paradigm_list = SuffixAnalyzer.guess_word_by_suffix(surface_form)
+        if para_filter is not None:
+            require = frozenset(require)
+            paradigm_list = [paradigm_str for paradigm_str in paradigm_list if require <= lookup_paradigm(paradigm_str).tags]
+        return [(lemma, paradigm_str) for paradigm_str in paradigm_list]
+
+    def analyze_compound(self, surface_form, require=None):
+        """
+        Analyze an unknown compound by its head word. Lemma is the full word with the head's lemma.
+        Args:
+            surface_form: compound word e.g. Bundesdatenschutzbeauftragter
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
+        Returns:
+            list of ParsedResult objects, empty list if the word doesn't split into known words
+        Raises:
+            None
+        Examples:
+            >>> analyzer.analyze_compound(u"Bundesdatenschutzbeauftragter")
+            [{'CASE': 'nom', 'CATEGORY': 'NN', 'GENDER': 'masc', 'GUESSER': True, 'LEMMA': 'Bundesdatenschutzbeauftragter', 'NUMERUS': 'sing', 'PTB_TAG': 'NN', 'STTS_TAG': 'NN'}]
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        return [self._hydrate_guess(guess) for guess in self._compound_guesses(surface_form, require)]
+
+    def _compound_guesses(self, surface_form, require):
+        """
+        Raw analyses of analyze_compound, (lemma, paradigm id) pairs
+        """
+
+        split = self.compound_analyzer.split(surface_form)
+        if split is None:
+            return []
+
+        modifier, head = split
+        para_filter = self._paradigm_filter(require)
+        guesses = []
+        for (lemma_id, paradigm_id) in self.dictionary.find_paradigm_lemma_id(head):
+            if para_filter is not None and paradigm_id not in para_filter:
+                continue
+            head_lemma = self.dictionary.lookup_lemma(lemma_id)
+            guesses.append((modifier + head_lemma[:1].lower() + head_lemma[1:], paradigm_id))
+        return guesses
 
-    def analyze(self, surface_form):
+    def analyze(self, surface_form, require=None):
         """
-        Look up the word from dafsa, if not fall back onto suffix analyzer
+        Look up the word from dafsa, if not try splitting it as a compound, then fall back onto suffix analyzer
+        Exact spelling is tried first, it's the common case and doesn't branch at every vowel.
         Char subsitutes already has ü possibly u, ö possibly o i.e. umlauts. However, DAWG package only allows one char-to-one char
-        mapping. Hence ss<->ß, ü<->ue and  ö<->oe still remains uncovered and lead rather ugly code here
+        mapping. Hence ss<->ß, ü<->ue, ö<->oe and ä<->ae are explored by a separate walk over the dafsa, see Dictionary.find_spelling_variant
+        If required tags are given, analyses are filtered by their paradigm ids, results are built only for the matching ones.
+        A known word without matching analyses gives an empty list, it doesn't fall back onto guessers.
         Args:
             surface_form: word from lexicon
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
         Returns:
             list of ParsedResult objects
         Raises:
@@ -89,23 +372,291 @@ class Analyzer(object):
             >>> analyzer.analyze(u"Flughafen")
             [{'PTB_TAG': 'NN', 'NUMERUS': 'sing', 'CATEGORY': 'NN', 'CASE': 'acc', 'LEMMA': 'Flughafen', 'STTS_TAG': 'NN', 'GENDER': 'masc'},
              {'PTB_TAG': 'NN', 'NUMERUS': 'sing', 'CATEGORY': 'NN', 'CASE': 'dat', 'LEMMA': 'Flughafen', 'STTS_TAG': 'NN', 'GENDER': 'masc'}, {'PTB_TAG': 'NN', 'NUMERUS': 'sing', 'CATEGORY': 'NN', 'CASE':             'nom', 'LEMMA': 'Flughafen', 'STTS_TAG': 'NN', 'GENDER': 'masc'}]
+            >>> analyzer.analyze(u"Flughafen", require={u"nom"})
+            [{'PTB_TAG': 'NN', 'NUMERUS': 'sing', 'CATEGORY': 'NN', 'CASE': 'nom', 'LEMMA': 'Flughafen', 'STTS_TAG': 'NN', 'GENDER': 'masc'}]
         """
 
-        similar_words = self.dictionary.find_similar_words(surface_form, self.char_substitutes)
+        return self.analyze_with_form(surface_form, require)[1]
+
+    def analyze_with_form(self, surface_form, require=None):
+        """
+        Analyze like analyze, also return the lexicon spelling that matched the word
+        Args:
+            surface_form: word from lexicon
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
+        Returns:
+            (matched form, list of ParsedResult objects) pair. Matched form is None if analyses come from compound or suffix analyzer.
+        Raises:
+            None
+        Examples:
+            >>> Analyzer(case_fold=True).analyze_with_form(u"strasse")
+            ('Straße', [{'CASE': 'acc', 'CATEGORY': 'NN', 'GENDER': 'fem', 'LEMMA': 'Straße', 'NUMERUS': 'sing', 'PTB_TAG': 'NN', 'STTS_TAG': 'NN'}, ...])
+        """
+
+        cache = self._cache
+        if cache is not None:
+            key = (u"analyze", surface_form, frozenset(require) if require else None)
+            cached = cache.get(key, self._MISSING)
+            if cached is not self._MISSING:
+                return cached[0], list(cached[1])
+
+        if self.dictionary is None:
+            self.warmup()
+        form, raw_results = self._analyze_raw(surface_form, require)
+        if form is not None:
+            results = [self._parsed_result(lemma_paradigm_id) for lemma_paradigm_id in raw_results]
+        else:
+            results = [self._hydrate_guess(guess) for guess in raw_results]
+
+        if cache is not None:
+            cache[key] = (form, tuple(results))
+        return form, results
+
+    def analyze_raw(self, surface_form, require=None):
+        """
+        Analyze like analyze, without building ParsedResult objects. Results are plain tuples:
+        (lemma id, paradigm id) for lexicon words,
+        (lemma, paradigm id) for compounds and suffix index guesses,
+        (lemma, paradigm string) for guesses of the hand-written verb and participle endings.
+        i.e. lemma is a string exactly when the analysis is a guess. Use hydrate to turn a tuple into a ParsedResult.
+        Args:
+            surface_form: word from lexicon
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
+        Returns:
+            list of tuples
+        Raises:
+            None
+        Examples:
+            >>> lemma_id, paradigm_id = analyzer.analyze_raw(u"Flughafen")[0]
+            >>> analyzer.dictionary.lookup_lemma(lemma_id)
+            'Flughafen'
+            >>> analyzer.analyze_raw(u"googelte")
+            [('googelen', 'V,1per,sing,past,ind'), ('googelen', 'V,1per,sing,past,subj'), ...]
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        return self._analyze_raw(surface_form, require)[1]
+
+    def _analyze_raw(self, surface_form, require):
+        """
+        Return (matched form, raw results) pair, form is None for guesses. Pairs are read from and kept in the persistent cache.
+        """
+
+        store = self._store
+        if store is None:
+            return self._lookup_raw(surface_form, require)
+
+        key = PersistentCache.make_key(surface_form, require)
+        record = store.get(key)
+        if record is not None:
+            return record[0], list(record[1])
+        form, raw_results = self._lookup_raw(surface_form, require)
+        store[key] = (form, tuple(raw_results))
+        return form, raw_results
+
+    def _lookup_raw(self, surface_form, require):
+        form, para_lemma_id_list = self._find_records(surface_form)
+        if form is not None:
+            para_filter = self._paradigm_filter(require)
+            if para_filter is not None:
+                para_lemma_id_list = [lemma_paradigm_id for lemma_paradigm_id in para_lemma_id_list if lemma_paradigm_id[1] in para_filter]
+            return form, para_lemma_id_list
+        if self.compounds:
+            #Compound is known by its split, not by its analyses
+            if self.compound_analyzer.split(surface_form) is not None:
+                return None, self._compound_guesses(surface_form, require)
+        return None, self._ending_guesses(surface_form, require)
+
+    def hydrate(self, raw_result):
+        """
+        Turn a tuple of analyze_raw into a ParsedResult
+        Args:
+            raw_result: tuple of analyze_raw
+        Returns:
+            ParsedResult object
+        Raises:
+            IndexError if lemma or paradigm id is out of range
+        Examples:
+            >>> [analyzer.hydrate(raw_result) for raw_result in analyzer.analyze_raw(u"Flughafen")] == analyzer.analyze(u"Flughafen")
+            True
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        if isinstance(raw_result[0], numbers.Integral):
+            return self._parsed_result(tuple(raw_result))
+        return self._hydrate_guess(raw_result)
+
+    def _hydrate_guess(self, guess):
+        lemma, paradigm = guess
+        if isinstance(paradigm, numbers.Integral):
+            paradigm = self.dictionary.lookup_paradigm_features(paradigm)
+        else:
+            paradigm = lookup_paradigm(paradigm)
+        return ParsedResult(paradigm, lemma, guesser=True)
+
+    def _find_records(self, surface_form):
+        """
+        Find the lexicon spelling of the word and its (lemma id, paradigm id) pairs.
+        Cheap exact lookups come first, then umlaut substitution, then the walk over spelling variants.
+        If there's a Bloom filter, words it rejects skip all but the first lookup.
+        Returns:
+            (form, list of tuples) pair, (None, []) if no spelling of the word is in lexicon
+        """
+
+        dictionary = self.dictionary
+        para_lemma_id_list = dictionary.find_paradigm_lemma_id(surface_form)
+        if para_lemma_id_list:
+            return surface_form, para_lemma_id_list
+        #Definite misses skip the spelling variants
+        if not dictionary.maybe_known(surface_form):
+            return None, []
+
+        if self.case_fold and surface_form:
+            form = self.swap_first_case(surface_form)
+            para_lemma_id_list = dictionary.find_paradigm_lemma_id(form)
+            if para_lemma_id_list:
+                return form, para_lemma_id_list
+
+        similar_words = dictionary.find_similar_words(surface_form, self.char_substitutes)
         if similar_words:
-            return self.analyze_by_dafsa(similar_words[0])
+            form = similar_words[0]
         else:
-            nword = surface_form
-            for em in self.extra_char_mappings:
-                nword = nword.replace(em, self.extra_char_mappings[em])
-            if nword != surface_form:
-                if self.is_known(nword):
-                    return self.analyze_by_dafsa(nword)
-            return self.analyze_by_ending(surface_form)
+            form = dictionary.find_spelling_variant(surface_form, self.spelling_substitutes, case_fold=self.case_fold)
+            if form is None:
+                return None, []
+
+        return form, dictionary.find_paradigm_lemma_id(form)
+
+    @staticmethod
+    def swap_first_case(word):
+        """
+        Swap case of the first letter, haus -> Haus, Der -> der
+        """
+        first = word[0]
+        return (first.lower() if first.isupper() else first.upper()) + word[1:]
+
+    def analyze_many(self, surface_forms, require=None):
+        """
+        Analyze a batch of words. Duplicate surface forms are analyzed only once.
+        Args:
+            surface_forms: iterable of words
+            require: iterable of tags, only analyses having all of them are returned. Default is no filter
+        Returns:
+            AnalyzedBatch object, one list of ParsedResult objects per word in input order
+        Raises:
+            None
+        Examples:
+            >>> batch = analyzer.analyze_many([u"Ich", u"gehe", u"und", u"ich", u"gehe"])
+            >>> batch.n_tokens, batch.n_types
+            (5, 4)
+            >>> batch[1]
+            [{'CATEGORY': 'V', 'LEMMA': 'gehen', 'MODE': 'ind', 'NUMERUS': 'sing', 'PERSON': '1per', 'PTB_TAG': 'V', 'STTS_TAG': 'V', 'TENSE': 'pres'}]
+        """
+
+        type_index = {}
+        types = []
+        token_types = array.array(str("I"))
+        for surface_form in surface_forms:
+            index = type_index.get(surface_form)
+            if index is None:
+                index = type_index[surface_form] = len(types)
+                types.append(surface_form)
+            token_types.append(index)
+
+        analyses = [self.analyze(surface_form, require) for surface_form in types]
+        return AnalyzedBatch(types, analyses, token_types)
+
+    def lemmatize(self, surface_form):
+        """
+        Find lemmas of the word, without building analyses. Lemma ids are read from the dafsa records and decoded once each.
+        Spelling substitution, compound and suffix analyzer fallbacks are the same as of analyze.
+        Args:
+            surface_form: word from lexicon
+        Returns:
+            list of distinct lemmas, in the order of the analyses
+        Raises:
+            None
+        Examples:
+            >>> analyzer.lemmatize(u"gegangen")
+            ['gegangen', 'gehen']
+        """
+
+        cache = self._cache
+        if cache is not None:
+            key = (u"lemmatize", surface_form)
+            cached = cache.get(key, self._MISSING)
+            if cached is not self._MISSING:
+                return list(cached)
+            lemmas = self._lemmatize(surface_form)
+            cache[key] = tuple(lemmas)
+            return lemmas
+        return self._lemmatize(surface_form)
+
+    def _lemmatize(self, surface_form):
+        if self.dictionary is None:
+            self.warmup()
+        form, raw_results = self._analyze_raw(surface_form, None)
+        if form is not None:
+            lemma_ids = []
+            for (lemma_id, paradigm_id) in raw_results:
+                if lemma_id not in lemma_ids:
+                    lemma_ids.append(lemma_id)
+            return [self._lemma(lemma_id) for lemma_id in lemma_ids]
+
+        lemmas = []
+        for (lemma, paradigm) in raw_results:
+            if lemma not in lemmas:
+                lemmas.append(lemma)
+        return lemmas
+
+    def _lemma(self, lemma_id):
+        """
+        Return the interned lemma of a lemma id, decode it if it's not in the pool
+        """
+
+        try:
+            pool = self._local.lemma_pool
+        except AttributeError:
+            pool = self._pools().lemma_pool
+        if pool is not None:
+            try:
+                return pool[lemma_id]
+            except KeyError:
+                pass
+
+        lemma = self.dictionary.lookup_lemma(lemma_id)
+        if pool is not None:
+            pool[lemma_id] = lemma
+        return lemma
+
+    def lemmatize_many(self, surface_forms):
+        """
+        Lemmatize a batch of words. Duplicate surface forms are lemmatized only once and share their lemma list.
+        Args:
+            surface_forms: iterable of words
+        Returns:
+            list of lemma lists, in input order
+        Raises:
+            None
+        Examples:
+            >>> analyzer.lemmatize_many([u"Ich", u"gehe", u"und", u"ich", u"gehe"])[1]
+            ['gehen']
+        """
+
+        type_lemmas = {}
+        lemmas = []
+        for surface_form in surface_forms:
+            word_lemmas = type_lemmas.get(surface_form)
+            if word_lemmas is None:
+                word_lemmas = type_lemmas[surface_form] = self.lemmatize(surface_form)
+            lemmas.append(word_lemmas)
+        return lemmas
 
     def is_known(self, word):
         """
-        Return if word is in known words. Char substitution is upto the initialization.
+        Return if word is in known words. Char substitution and case folding are upto the initialization.
         Args:
             word: word as in lexicon, geschreiben, bist, angerufen...
         Returns:
@@ -123,11 +674,275 @@ class Analyzer(object):
             True
         """
 
-        return self.dictionary.is_known(
-                word=word,
+        cache = self._cache
+        if cache is not None:
+            key = (u"is_known", word)
+            known = cache.get(key)
+            if known is None:
+                known = cache[key] = self._is_known(word)
+            return known
+        return self._is_known(word)
+
+    def _is_known(self, word):
+        if self.dictionary is None:
+            self.warmup()
+        if self.dictionary.is_known(word=word, char_substitutes=self.char_substitutes):
+            return True
+        return bool(self.case_fold and word) and self.dictionary.is_known(
+                word=self.swap_first_case(word),
                 char_substitutes=self.char_substitutes
                 )
     
+    def cache_info(self):
+        """
+        Report effectiveness of the analysis cache, like functools.lru_cache
+        Returns:
+            CacheInfo named tuple of hits, misses, evictions, maxsize and current size. maxsize is None for an unbounded cache,
+            0 if there's no cache.
+        Examples:
+            >>> analyzer = Analyzer(cache=200)
+            >>> analyzer.analyze(u"gehe"), analyzer.analyze(u"gehe")
+            >>> analyzer.cache_info()
+            CacheInfo(hits=1, misses=1, evictions=0, maxsize=200, currsize=1)
+        """
+
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._cache.cache_info()
+
+    def cache_clear(self):
+        """
+        Empty the analysis cache and reset its counters
+        """
+
+        if self._cache is not None:
+            self._cache.cache_clear()
+
+    def cache_warmup(self, words=None, top=None, methods=("analyze",)):
+        """
+        Fill the analysis caches from a word frequency list, so that a new worker doesn't start cold.
+        Words are analyzed from the least frequent to the most frequent, hence the most frequent ones are evicted last.
+        Persistent cache is filled as well, if there's one.
+        Args:
+            words: iterable of words most frequent first, or path of a UTF-8 frequency list file. A line of the file holds a word,
+                   optionally preceded by its rank and followed by its count. Default is the bundled list of frequent German words.
+            top: number of words from the top of the list, default is all words. It's capped by the cache size.
+            methods: names of the cached methods to call per word, any of "analyze", "lemmatize" and "is_known"
+        Returns:
+            number of words analyzed
+        Raises:
+            ValueError if a method isn't cached or the analyzer has neither cache nor persistent cache
+            IOError if the file can't be read
+        Examples:
+            >>> analyzer = Analyzer(char_subs_allowed=True, cache=20000)
+            >>> analyzer.cache_warmup()
+            205
+            >>> analyzer.cache_warmup(u"/data/dewiki-frequencies.txt", top=10000, methods=("analyze", "lemmatize"))
+            10000
+        """
+
+        if self._cache is None and self.persistent_cache_path is None:
+            raise ValueError("analyzer has no cache to warm up")
+        calls = [self._cached_method(method) for method in methods]
+        if words is None:
+            words = frequent_words
+        elif isinstance(words, (type(u""), type(b""))):
+            words = self.read_frequency_list(words, top)
+        else:
+            words = list(words)
+
+        #More words than the cache holds would evict the most frequent ones
+        if self._cache is not None and self._cache.maxsize is not None:
+            top = min(top or self._cache.maxsize, max(1, self._cache.maxsize // max(1, len(calls))))
+        if top:
+            words = words[:top]
+        for word in reversed(words):
+            for call in calls:
+                call(word)
+        return len(words)
+
+    def _cached_method(self, method):
+        if method not in (u"analyze", u"lemmatize", u"is_known"):
+            raise ValueError("%s results aren't cached" % method)
+        return getattr(self, method)
+
+    @staticmethod
+    def read_frequency_list(path, top=None):
+        """
+        Read words of a frequency list file, see cache_warmup
+        Args:
+            path: file path
+            top: number of words to read, default is all words
+        Returns:
+            list of words, in file order
+        """
+
+        words = []
+        with io.open(path, encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if not fields or fields[0].startswith(u"#"):
+                    continue
+                words.append(fields[1] if len(fields) > 1 and fields[0].isdigit() else fields[0])
+                if top and len(words) == top:
+                    break
+        return words
+
+    def cache_dump(self, path):
+        """
+        Write a snapshot of the analysis cache, for cache_restore of another analyzer, e.g. of a newly started worker.
+        Only the cached calls are written, not their results. Hence a snapshot is small and stays valid after dictionary updates.
+        Args:
+            path: file path
+        Returns:
+            number of entries written
+        Examples:
+            >>> analyzer.cache_dump(u"/var/cache/demorphy/snapshot.txt")
+            200
+        """
+
+        lines = [self.SNAPSHOT_HEADER]
+        for key in (self._cache.keys() if self._cache is not None else []):
+            method, word = key[0], key[1]
+            #Tab and newline separate the fields
+            if u"\t" in word or u"\n" in word:
+                continue
+            if method == u"analyze" and key[2]:
+                lines.append(u"%s\t%s\t%s" % (method, word, u",".join(sorted(key[2]))))
+            else:
+                lines.append(u"%s\t%s" % (method, word))
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(u"\n".join(lines) + u"\n")
+        return len(lines) - 1
+
+    def cache_restore(self, path):
+        """
+        Fill the analysis cache from a snapshot of cache_dump. Calls are repeated from the least recently used one,
+        so that most recently used words are kept if this cache is smaller.
+        Args:
+            path: file path
+        Returns:
+            number of entries restored
+        Raises:
+            ValueError if file is not a cache snapshot
+        Examples:
+            >>> Analyzer(char_subs_allowed=True, cache=200).cache_restore(u"/var/cache/demorphy/snapshot.txt")
+            200
+        """
+
+        with io.open(path, encoding="utf-8") as f:
+            lines = f.read().split(u"\n")
+        if lines[0] != self.SNAPSHOT_HEADER:
+            raise ValueError("%s is not a cache snapshot" % path)
+        entries = [line.split(u"\t") for line in lines[1:] if line]
+        if self._cache is not None and self._cache.maxsize is not None:
+            entries = entries[:self._cache.maxsize]
+
+        for fields in reversed(entries):
+            call = self._cached_method(fields[0])
+            if len(fields) > 2:
+                call(fields[1], fields[2].split(u","))
+            else:
+                call(fields[1])
+        return len(entries)
+
+    def sync_cache(self):
+        """
+        Write analyses kept in memory into the persistent cache file, if there's one
+        """
+
+        if self._store is not None:
+            self._store.sync()
+
+    def close(self):
+        """
+        Sync and close the persistent cache file, if there's one. Analyzer still works afterwards, without the file.
+        Examples:
+            >>> with Analyzer(persistent_cache="analyses") as analyzer:
+            ...     analyzer.analyze(u"gehe")
+        """
+
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def inflect(self, lemma):
+        """
+        Find all inflected forms of a lemma. Needs the form index, see README.
+        Args:
+            lemma: lemma as in lexicon, gehen, Haus, groß...
+        Returns:
+            list of (form, ParsedResult) pairs, empty list if lemma is not in lexicon
+        Raises:
+            IOError if the form index wasn't built
+        Examples:
+            >>> analyzer.inflect(u"Haus")[:2]
+            [('Haus', {'CASE': 'acc', 'CATEGORY': 'NN', 'GENDER': 'neut', 'LEMMA': 'Haus', 'NUMERUS': 'sing', 'PTB_TAG': 'NN', 'STTS_TAG': 'NN'}), ('Haus', {'CASE': 'dat', ...})]
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        return [(form, ParsedResult(self.dictionary.lookup_paradigm_features(paradigm_id), lemma))
+                for (form, paradigm_id) in self.dictionary.find_forms(lemma)]
+
+    def generate(self, lemma, tags):
+        """
+        Find forms of a lemma that have all of the given tags
+        Args:
+            lemma: lemma as in lexicon
+            tags: iterable of tags, e.g. (u"gen", u"plu")
+        Returns:
+            list of distinct forms, sorted
+        Raises:
+            IOError if the form index wasn't built
+        Examples:
+            >>> analyzer.generate(u"Haus", [u"dat", u"plu"])
+            ['Häusern']
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        tags = frozenset(tags)
+        forms = set()
+        for (form, paradigm_id) in self.dictionary.find_forms(lemma):
+            if tags <= self.dictionary.lookup_paradigm_features(paradigm_id).tags:
+                forms.add(form)
+        return sorted(forms)
+
+    def find_words(self, tags, *more_tags):
+        """
+        Find all lexicon words having an analysis with all of the given tags. Needs the tag index, see README.
+        More tag sets intersect the results, i.e. words having an analysis for each tag set are found.
+        Args:
+            tags: iterable of tags, e.g. (u"NN", u"gen", u"plu")
+            more_tags: further iterables of tags
+        Returns:
+            list of words, in lexicon order
+        Raises:
+            IOError if the tag index wasn't built
+        Examples:
+            >>> u"kann" in analyzer.find_words([u"V", u"<mod>"])
+            True
+            >>> u"Häusern" in analyzer.find_words([u"NN", u"dat", u"plu"])
+            True
+        """
+
+        if self.dictionary is None:
+            self.warmup()
+        word_ids = self.dictionary.find_word_ids(tags)
+        for next_tags in more_tags:
+            if not word_ids:
+                break
+            word_ids &= self.dictionary.find_word_ids(next_tags)
+        return [self.dictionary.lookup_word(word_id) for word_id in sorted(word_ids)]
+
     def iter_lexicon_formatted(self, prefix=u""):
         """
         Iterate over all lexicon, by prefix on demand. Default is empty prefix i.e. all words
@@ -137,8 +952,10 @@ class Analyzer(object):
             (word, ParsedResult) pairs
         """
 
-        for (word, paradigm_str, lemma) in self.dictionary.iter_lexicon(prefix):
-            yield word, ParsedResult(paradigm_str, lemma)
+        if self.dictionary is None:
+            self.warmup()
+        for (word, lemma_id, paradigm_id) in self.dictionary.iter_lexicon_ids(prefix):
+            yield word, ParsedResult(self.dictionary.lookup_paradigm_features(paradigm_id), self.dictionary.lookup_lemma(lemma_id))
     
     @classmethod
     def find_dictionary_path(cls):
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 
-__all__ = ["lrudecorator", "lrucache", "memoize"]
+__all__ = ["lrudecorator", "lrucache", "memoize", "shardedlrucache", "shardedlrudecorator", "CountingCache", "CacheInfo", "PersistentCache"]
 
 
+from demorphy.cache.counting_cache import CountingCache, CacheInfo
+from demorphy.cache.persistent_cache import PersistentCache
 from demorphy.cache.pylru import lrudecorator, lrucache
+from demorphy.cache.sharded_cache import shardedlrucache, shardedlrudecorator
 from demorphy.cache.simple_cache import memoize
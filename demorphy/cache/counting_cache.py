@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import itertools
+import threading
+
+from demorphy.cache.pylru import lrucache
+from demorphy.cache.sharded_cache import shardedlrucache
+
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class _Shard(object):
+    __slots__ = ["lock", "store", "table", "last_used", "hits", "misses", "evictions"]
+
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.store = {} if size is None else lrucache(size, callback=self._evicted)
+        #Membership is checked on the plain dict, cheaper than raising KeyError on misses
+        self.table = self.store if size is None else self.store.table
+        #Key -> tick of the cache wide clock at its last use, orders keys across shards
+        self.last_used = {}
+        self.hits = self.misses = self.evictions = 0
+
+    def _evicted(self, key, value):
+        #Called by lrucache under the lock
+        self.evictions += 1
+        del self.last_used[key]
+
+
+class CountingCache(object):
+    """
+    Thread safe cache counting its hits, misses and evictions, like functools.lru_cache but usable inside methods.
+    Bounded caches evict the least recently used entry, a maxsize of None means unbounded.
+    Keys are spread over shards with their own locks and counters, as in shardedlrucache.
+    Eviction is least recently used within a shard, a cache wide clock keeps the recency order of all keys for snapshots.
+    """
+
+    MIN_SHARD_SIZE = 64
+
+    def __init__(self, maxsize=None, shards=shardedlrucache.DEFAULT_SHARDS):
+        """
+        Args:
+            maxsize: positive integer, or None for an unbounded cache
+            shards: number of shards, i.e. locks
+        Raises:
+            ValueError if maxsize is not positive
+        """
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("cache size must be positive")
+        self.maxsize = maxsize
+        #Small caches aren't split, shards of a few entries would evict far from LRU order
+        if maxsize is not None:
+            shards = max(1, min(shards, maxsize // self.MIN_SHARD_SIZE))
+        shard_sizes = [None] * shards if maxsize is None else shardedlrucache._shard_sizes(maxsize, shards)
+        self._shards = [_Shard(shard_size) for shard_size in shard_sizes]
+        #next() of itertools.count is atomic
+        self._clock = itertools.count()
+
+    def get(self, key, default=None):
+        """
+        Look up key, count a hit or a miss
+        Args:
+            key: hashable
+            default: returned on a miss
+        Returns:
+            cached value, default if key is not cached
+        """
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            if key not in shard.table:
+                shard.misses += 1
+                return default
+            shard.hits += 1
+            shard.last_used[key] = next(self._clock)
+            return shard.store[key]
+
+    def __setitem__(self, key, value):
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            shard.store[key] = value
+            shard.last_used[key] = next(self._clock)
+
+    def __contains__(self, key):
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            return key in shard.store
+
+    def __len__(self):
+        return sum(len(shard.store) for shard in self._shards)
+
+    def keys(self):
+        """
+        Snapshot of the cached keys, most recently used first over all shards
+        """
+        ticks = []
+        for shard in self._shards:
+            with shard.lock:
+                ticks.extend((tick, key) for key, tick in shard.last_used.items())
+        ticks.sort(key=lambda tick_key: tick_key[0], reverse=True)
+        return [key for tick, key in ticks]
+
+    @property
+    def hits(self):
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self):
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self):
+        return sum(shard.evictions for shard in self._shards)
+
+    def cache_info(self):
+        """
+        Returns:
+            CacheInfo named tuple of hits, misses, evictions, maxsize and current size
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self))
+
+    def cache_clear(self):
+        """
+        Drop all entries and reset the counters
+        """
+        for shard in self._shards:
+            with shard.lock:
+                shard.store.clear()
+                shard.last_used.clear()
+                shard.hits = shard.misses = shard.evictions = 0
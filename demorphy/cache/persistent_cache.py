@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import array
+import re
+import sys
+import threading
+
+try:
+    import dbm
+except ImportError:
+    import anydbm as dbm
+
+from demorphy.cache.pylru import lruwrap
+from demorphy.cache.sharded_cache import shardedlrucache
+from demorphy.version import __version__
+
+#Separators of records and keys, escaped in words and lemmas by a backslash
+ESCAPES = {u"\\": u"\\\\", u"\t": u"\\t", u"\n": u"\\n", u"\0": u"\\0"}
+UNESCAPES = dict((escaped[1], char) for (char, escaped) in ESCAPES.items())
+ESCAPE_RE = re.compile(u"[\\\\\t\n\0]")
+UNESCAPE_RE = re.compile(u"\\\\(.)", re.DOTALL)
+
+
+def escape(text):
+    return ESCAPE_RE.sub(lambda match: ESCAPES[match.group()], text)
+
+
+def unescape(text):
+    """
+    Raises:
+        ValueError on an unknown escape
+    """
+    try:
+        return UNESCAPE_RE.sub(lambda match: UNESCAPES[match.group(1)], text)
+    except KeyError:
+        raise ValueError("bad escape in %r" % text)
+
+
+def dump_record(form, raw_results):
+    """
+    Serialize a (matched form, raw results) pair of Analyzer.analyze_raw.
+    Lexicon analyses are stored as the form and a flat uint32 array of lemma and paradigm ids, i.e. 8 bytes per analysis.
+    Guesses are stored as lines of lemma and paradigm id or paradigm string, separated by a tab. Lemmas are escaped,
+    guesses of a word with a tab or a newline have them in the lemma.
+    Args:
+        form: matched lexicon spelling, None for guesses
+        raw_results: list of raw result tuples
+    Returns:
+        bytes
+    """
+    if form is not None:
+        ids = array.array(str("I"))
+        for lemma_paradigm_id in raw_results:
+            ids.extend(lemma_paradigm_id)
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return b"L" + form.encode("utf-8") + b"\0" + (ids.tostring() if sys.version_info[0] < 3 else ids.tobytes())
+    return b"G" + u"\n".join(u"%s\t%s" % (escape(lemma), escape(u"%s" % paradigm)) for (lemma, paradigm) in raw_results).encode("utf-8")
+
+
+def load_record(record):
+    """
+    Deserialize a record of dump_record
+    Returns:
+        (matched form, tuple of raw results) pair
+    Raises:
+        ValueError if record is malformed
+    """
+    kind, data = record[:1], record[1:]
+    if kind == b"L":
+        form, ids_data = data.split(b"\0", 1)
+        ids = array.array(str("I"))
+        if sys.version_info[0] < 3:
+            ids.fromstring(ids_data)
+        else:
+            ids.frombytes(ids_data)
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return form.decode("utf-8"), tuple(zip(ids[::2], ids[1::2]))
+    if kind == b"G":
+        guesses = []
+        for line in data.decode("utf-8").split(u"\n") if data else ():
+            lemma, paradigm = line.split(u"\t")
+            lemma, paradigm = unescape(lemma), unescape(paradigm)
+            guesses.append((lemma, int(paradigm) if paradigm.isdigit() else paradigm))
+        return None, tuple(guesses)
+    raise ValueError("unknown record kind %r" % kind)
+
+
+class RecordStore(object):
+    """
+    Mapping of analysis cache keys to records over a dbm file, records are serialized on writes and deserialized on reads.
+    This is the backing store of PersistentCache's write back LRU caches, shared by all of them.
+    dbm objects aren't thread safe, file accesses are serialized by a lock. Records are (de)serialized outside of it.
+    A malformed record, e.g. of a file written by a crashed process, is a missing key.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(key):
+        return key.encode("utf-8")
+
+    def __contains__(self, key):
+        key = self._key(key)
+        with self.lock:
+            return key in self.db
+
+    def __getitem__(self, key):
+        key = self._key(key)
+        with self.lock:
+            record = self.db[key]
+        try:
+            return load_record(record)
+        except ValueError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        key, record = self._key(key), dump_record(*value)
+        with self.lock:
+            self.db[key] = record
+
+    def __delitem__(self, key):
+        key = self._key(key)
+        with self.lock:
+            del self.db[key]
+
+
+class PersistentCache(object):
+    """
+    Analysis cache kept in a dbm file across runs. Recently used records are held deserialized in write back LRU caches,
+    they're written to the file when they're evicted, on sync and on close.
+    The file is stamped with the library version and a fingerprint of the dictionary and analyzer settings. If the stamp
+    differs on opening, e.g. the dictionary was rebuilt or DEMorphy upgraded, the file is emptied.
+    All methods are thread safe. Keys are spread over shards with their own locks as in shardedlrucache, so threads hitting
+    records in memory don't wait for each other; only file reads and writes are serialized. A file can be opened by one
+    process at a time.
+    """
+
+    DEFAULT_SIZE = 20000
+    #Bumped when the record layout changes, stale files are emptied like files of another dictionary
+    FORMAT_VERSION = 2
+    #Keys are escaped, they don't begin with a NUL
+    FINGERPRINT_KEY = b"\0fingerprint"
+
+    def __init__(self, path, fingerprint, size=DEFAULT_SIZE, shards=shardedlrucache.DEFAULT_SHARDS):
+        """
+        Args:
+            path: dbm file path, created if it doesn't exist
+            fingerprint: string identifying the dictionary and settings records were computed with
+            size: number of records held in memory, split evenly over the shards
+            shards: number of shards, i.e. locks, at most size
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        stamp = (u"%d:%s:%s" % (self.FORMAT_VERSION, __version__, fingerprint)).encode("utf-8")
+
+        db = dbm.open(path, "c")
+        if db.get(self.FINGERPRINT_KEY) != stamp:
+            db.close()
+            db = dbm.open(path, "n")
+            db[self.FINGERPRINT_KEY] = stamp
+        self.db = db
+
+        store = self._store = RecordStore(db)
+        shards = max(1, min(shards, size))
+        #(lock, write back cache) pairs
+        self._shards = [(threading.Lock(), lruwrap(store, shard_size, writeback=True))
+                        for shard_size in shardedlrucache._shard_sizes(size, shards)]
+
+    @staticmethod
+    def make_key(surface_form, require=None):
+        """
+        Key of a word's record, required tags are part of it. The word is escaped, so that it can't collide with
+        the key of another word and required tags.
+        """
+        surface_form = escape(surface_form)
+        if not require:
+            return surface_form
+        return u"%s\t%s" % (surface_form, u",".join(sorted(require)))
+
+    def get(self, key, default=None):
+        """
+        Look up a record, in memory first, then in the file
+        Returns:
+            (matched form, tuple of raw results) pair, default if key isn't cached
+        """
+        lock, cache = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            if self.db is None:
+                return default
+            try:
+                return cache[key]
+            except KeyError:
+                return default
+
+    def __setitem__(self, key, value):
+        lock, cache = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            if self.db is not None:
+                cache[key] = value
+
+    def sync(self):
+        """
+        Write records added since the last sync into the file
+        """
+        for lock, cache in self._shards:
+            with lock:
+                if self.db is not None:
+                    cache.sync()
+        with self._store.lock:
+            if self.db is not None and hasattr(self.db, "sync"):
+                self.db.sync()
+
+    def close(self):
+        """
+        Sync and close the file, later lookups miss and writes are dropped. Closing twice is harmless.
+        """
+        self.sync()
+        #All shards are held, so that no lookup runs on the closed file
+        locks = [lock for lock, cache in self._shards]
+        for lock in locks:
+            lock.acquire()
+        try:
+            with self._store.lock:
+                if self.db is not None:
+                    self.db.close()
+                    self.db = None
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import functools
+import threading
+
+from demorphy.cache.pylru import lrucache
+
+
+class shardedlrucache(object):
+    """
+    Thread safe variant of lrucache. Keys are spread by their hash over shards, each shard is an lrucache with its own lock,
+    so threads working on different shards don't wait for each other.
+    Least recently used order is kept per shard, a full shard evicts its own least recently used entry.
+    """
+
+    DEFAULT_SHARDS = 16
+
+    def __init__(self, size, shards=DEFAULT_SHARDS, callback=None):
+        """
+        Args:
+            size: total number of entries, split evenly over the shards
+            shards: number of shards, i.e. locks, at most size
+            callback: called with key and value of evicted entries, under the lock of the shard
+        """
+        self.callback = callback
+        shards = max(1, min(shards, size))
+        #(lock, lrucache) pairs
+        self._shards = [(threading.Lock(), lrucache(shard_size, callback)) for shard_size in self._shard_sizes(size, shards)]
+
+    @staticmethod
+    def _shard_sizes(size, shards):
+        """
+        Split size over the shards, the first size % shards shards hold one entry more. Sizes add up to size
+        as long as it's not below the number of shards, every shard holds at least one entry.
+        """
+        return [max(1, size // shards + (1 if i < size % shards else 0)) for i in range(shards)]
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    def __len__(self):
+        return sum(len(cache) for lock, cache in self._shards)
+
+    def clear(self):
+        for lock, cache in self._shards:
+            with lock:
+                cache.clear()
+
+    def __contains__(self, key):
+        lock, cache = self._shard(key)
+        with lock:
+            return key in cache
+
+    def peek(self, key):
+        lock, cache = self._shard(key)
+        with lock:
+            return cache.peek(key)
+
+    def __getitem__(self, key):
+        lock, cache = self._shard(key)
+        with lock:
+            return cache[key]
+
+    def get(self, key, default=None):
+        """Get an item - return default (None) if not present"""
+        lock, cache = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            #Cheaper than raising KeyError on misses
+            if key not in cache.table:
+                return default
+            return cache[key]
+
+    def __setitem__(self, key, value):
+        lock, cache = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            cache[key] = value
+
+    def update(self, items):
+        for key, value in items.items():
+            self[key] = value
+
+    def __delitem__(self, key):
+        lock, cache = self._shard(key)
+        with lock:
+            del cache[key]
+
+    def items(self):
+        """
+        Snapshot of (key, value) pairs, most recently used first within each shard
+        """
+        items = []
+        for lock, cache in self._shards:
+            with lock:
+                items.extend(cache.items())
+        return items
+
+    def keys(self):
+        return [key for key, value in self.items()]
+
+    def values(self):
+        return [value for key, value in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def size(self, size=None):
+        """
+        Return total size, resize all shards evenly if size is given.
+        The number of shards is fixed, a size below it leaves one entry per shard.
+        """
+        if size is not None:
+            assert size > 0
+            for (lock, cache), shard_size in zip(self._shards, self._shard_sizes(size, len(self._shards))):
+                with lock:
+                    cache.size(shard_size)
+        return sum(cache.size() for lock, cache in self._shards)
+
+
+class shardedlrudecorator(object):
+    """
+    Thread safe lrudecorator, results are kept in a shardedlrucache
+    """
+
+    def __init__(self, size, shards=shardedlrucache.DEFAULT_SHARDS):
+        self.cache = shardedlrucache(size, shards)
+
+    def __call__(self, func):
+        _missing = object()
+
+        def wrapper(*args, **kwargs):
+            kwtuple = tuple((key, kwargs[key]) for key in sorted(kwargs.keys()))
+            key = (args, kwtuple)
+            value = self.cache.get(key, _missing)
+            if value is not _missing:
+                return value
+
+            value = func(*args, **kwargs)
+            self.cache[key] = value
+            return value
+
+        wrapper.cache = self.cache
+        wrapper.size = self.cache.size
+        wrapper.clear = self.cache.clear
+        return functools.update_wrapper(wrapper, func)
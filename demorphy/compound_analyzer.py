@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+
+from demorphy.cache import lrucache
+
+
+class CompoundAnalyzer(object):
+    """
+    Class for splitting unknown German compounds into lexicon words, e.g. Bundesdatenschutzbeauftragter -> Bundes|daten|schutz|beauftragter.
+    The longest known head word is searched from the end of the word, the rest must split into known words, optionally followed by a linking element.
+    Split search is memoized and limited by a probe budget, so that long words have a bounded worst case. Split points are cached per word,
+    each thread has its own cache.
+    """
+
+    LINKING_ELEMENTS = (u"es", u"s", u"en", u"n")
+    MIN_PART_LEN = 3
+    MAX_WORD_LEN = 64
+    MAX_PROBES = 256
+
+    def __init__(self, dictionary, cache_size=10000):
+        """
+        Args:
+            dictionary: Dictionary object
+            cache_size: number of words whose split points are cached
+        """
+        self.dictionary = dictionary
+        self.cache_size = cache_size
+        self._local = threading.local()
+
+    def split(self, word):
+        """
+        Split word into its modifier and head
+        Args:
+            word: unicode string
+        Returns:
+            (modifier, head) pair, head is spelled as in the lexicon. None if the word doesn't split into lexicon words.
+        Raises:
+            None
+        Examples:
+            >>> compound_analyzer.split(u"Bundesdatenschutzbeauftragter")
+            ('Bundesdatenschutz', 'Beauftragter')
+        """
+        local = self._local
+        try:
+            splits = local.splits
+        except AttributeError:
+            splits = local.splits = lrucache(self.cache_size)
+
+        try:
+            return splits[word]
+        except KeyError:
+            pass
+
+        split = self._find_split(word)
+        splits[word] = split
+        return split
+
+    def _find_split(self, word):
+        if not 2*self.MIN_PART_LEN <= len(word) <= self.MAX_WORD_LEN:
+            return None
+
+        dafsa = self.dictionary.dafsa
+        budget = [self.MAX_PROBES]
+        memo = {}
+        #Longest head first
+        for pos in range(self.MIN_PART_LEN, len(word) - self.MIN_PART_LEN + 1):
+            head = word[pos:]
+            #Head as written, e.g. adjective heads, then as a noun
+            for form in unique((head, capitalize(head))):
+                budget[0] -= 1
+                if form in dafsa and self._is_modifier(word[:pos], memo, budget):
+                    return word[:pos], form
+            if budget[0] <= 0:
+                break
+
+        return None
+
+    def _is_modifier(self, part, memo, budget):
+        """
+        Return if part splits into lexicon words, each optionally followed by a linking element
+        """
+        if part in memo:
+            return memo[part]
+        memo[part] = False
+
+        result = False
+        for form in unique((capitalize(part), decapitalize(part))):
+            if budget[0] <= 0:
+                break
+            budget[0] -= 1
+            #Longest known prefix first
+            for prefix in reversed(self.dictionary.find_prefix_words(form)):
+                if len(prefix) < self.MIN_PART_LEN:
+                    break
+                rest = part[len(prefix):]
+                rests = [rest] + [rest[len(link):] for link in self.LINKING_ELEMENTS if rest.startswith(link)]
+                if any(not rest or (len(rest) >= self.MIN_PART_LEN and self._is_modifier(rest, memo, budget)) for rest in rests):
+                    result = True
+                    break
+            if result:
+                break
+
+        memo[part] = result
+        return result
+
+
+def unique(forms):
+    """Drop repeated forms, keep order"""
+    return [form for (index, form) in enumerate(forms) if form not in forms[:index]]
+
+
+def capitalize(word):
+    """Upper case first letter, keep the rest"""
+    return word[:1].upper() + word[1:]
+
+
+def decapitalize(word):
+    """Lower case first letter, keep the rest"""
+    return word[:1].lower() + word[1:]
@@ -2,13 +2,23 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import mmap
+import struct
+import sys
 
 try:
-    from dawg import DAWG, RecordDAWG
+    from dawg import DAWG, BytesDAWG, RecordDAWG
 except ImportError:
     mssg = ("Install dawg package!")
     raise NotImplementedError(mssg)
 
+try:
+    from dawg_python import RecordDAWG as PyRecordDAWG
+    from dawg_python.wrapper import Dictionary as PyDictionary, Guide as PyGuide
+except ImportError:
+    #memory mapped loading is optional, see MappedLexiconDawg
+    PyRecordDAWG = PyDictionary = PyGuide = object
+
 
 class LexiconDawg(RecordDAWG):
     """
@@ -25,3 +35,64 @@ class LexiconDawg(RecordDAWG):
             super(LexiconDawg, self).__init__(self.FORMAT)
         else:
            super(LexiconDawg, self).__init__(self.FORMAT, data)
+
+
+class _MappedDictionary(PyDictionary):
+    """
+    dawgdic units read directly from a memory mapped buffer instead of a private array
+    """
+
+    def __init__(self, buf):
+        base_size = struct.unpack(str("=I"), buf[:4])[0]
+        self._units = buf[4:4 + 4*base_size].cast(str("I"))
+        self.nbytes = 4 + 4*base_size
+
+
+class _MappedGuide(PyGuide):
+    """
+    dawgdic completion guide read directly from a memory mapped buffer
+    """
+
+    def __init__(self, buf):
+        base_size = struct.unpack(str("=I"), buf[:4])[0]
+        self._units = buf[4:4 + 2*base_size]
+        self.nbytes = 4 + 2*base_size
+
+
+class MappedLexiconDawg(PyRecordDAWG):
+    """
+    Read-only lexicon dag on top of a memory mapped words.dg
+    Pages come from the OS page cache, hence they are shared between all processes mapping the same file.
+    Lookups run in pure Python (DAWG-Python), so they are slower than LexiconDawg.
+    Needs Python 3, units are read through memoryview.cast.
+    """
+
+    FORMAT = LexiconDawg.FORMAT
+
+    def __init__(self):
+        if PyRecordDAWG is object:
+            mssg = ("Install DAWG-Python package for memory mapped dictionaries!")
+            raise NotImplementedError(mssg)
+        if sys.version_info[0] < 3:
+            mssg = ("Memory mapped dictionaries need Python 3!")
+            raise NotImplementedError(mssg)
+        super(MappedLexiconDawg, self).__init__(self.FORMAT)
+        self._mmap = None
+
+    def load(self, path):
+        """
+        Map the dag dump at path read-only
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buf = memoryview(self._mmap)
+        self.dct = _MappedDictionary(buf)
+        self.guide = _MappedGuide(buf[self.dct.nbytes:])
+        return self
+
+    def has_keys_with_prefix(self, prefix):
+        """
+        Return if any key begins with prefix, like LexiconDawg.has_keys_with_prefix
+        """
+        return self.dct.follow_bytes(prefix.encode("utf8"), self.dct.ROOT) is not None
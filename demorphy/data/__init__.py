@@ -1,3 +1,3 @@
 from demorphy.data.char_subs import *
-from demorphy.data.lemmas import lemmas
 from demorphy.data.paradigms import paradigms
+from demorphy.data.frequent_words import frequent_words
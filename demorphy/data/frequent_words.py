@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+"""
+Frequent German word forms of newspaper text, most frequent first. Default word list of Analyzer.cache_warmup
+"""
+
+frequent_words = [
+u"der",
+u"die",
+u"und",
+u"in",
+u"den",
+u"von",
+u"zu",
+u"das",
+u"mit",
+u"sich",
+u"des",
+u"auf",
+u"für",
+u"ist",
+u"im",
+u"dem",
+u"nicht",
+u"ein",
+u"Die",
+u"eine",
+u"als",
+u"auch",
+u"es",
+u"an",
+u"werden",
+u"aus",
+u"er",
+u"hat",
+u"dass",
+u"sie",
+u"nach",
+u"wird",
+u"bei",
+u"einer",
+u"Der",
+u"um",
+u"am",
+u"sind",
+u"noch",
+u"wie",
+u"einem",
+u"über",
+u"einen",
+u"Das",
+u"so",
+u"Sie",
+u"zum",
+u"war",
+u"haben",
+u"nur",
+u"oder",
+u"aber",
+u"vor",
+u"zur",
+u"bis",
+u"mehr",
+u"durch",
+u"man",
+u"sein",
+u"wurde",
+u"sei",
+u"In",
+u"Prozent",
+u"hatte",
+u"kann",
+u"gegen",
+u"vom",
+u"können",
+u"schon",
+u"wenn",
+u"habe",
+u"seine",
+u"Euro",
+u"ihre",
+u"dann",
+u"unter",
+u"wir",
+u"soll",
+u"ich",
+u"eines",
+u"Es",
+u"Jahr",
+u"zwei",
+u"Jahren",
+u"diese",
+u"dieser",
+u"wieder",
+u"keine",
+u"Uhr",
+u"seiner",
+u"worden",
+u"Und",
+u"will",
+u"zwischen",
+u"Im",
+u"immer",
+u"Millionen",
+u"Ein",
+u"was",
+u"sagte",
+u"gibt",
+u"alle",
+u"diesem",
+u"seit",
+u"muss",
+u"wurden",
+u"beim",
+u"doch",
+u"jetzt",
+u"waren",
+u"drei",
+u"Jahre",
+u"Mit",
+u"neue",
+u"neuen",
+u"damit",
+u"bereits",
+u"da",
+u"Auf",
+u"ihr",
+u"seinen",
+u"müssen",
+u"ab",
+u"ihrer",
+u"Nach",
+u"ohne",
+u"sondern",
+u"selbst",
+u"ersten",
+u"nun",
+u"etwa",
+u"Bei",
+u"heute",
+u"ihren",
+u"weil",
+u"ihm",
+u"Menschen",
+u"Deutschland",
+u"anderen",
+u"werde",
+u"Ich",
+u"sagt",
+u"Wir",
+u"Eine",
+u"rund",
+u"Für",
+u"Aber",
+u"ihn",
+u"Ende",
+u"jedoch",
+u"Zeit",
+u"sollen",
+u"ins",
+u"Wie",
+u"mich",
+u"also",
+u"Stadt",
+u"Berlin",
+u"wo",
+u"ob",
+u"Frau",
+u"Kinder",
+u"geht",
+u"dabei",
+u"sehr",
+u"gut",
+u"nichts",
+u"hier",
+u"gehen",
+u"Land",
+u"Regierung",
+u"Leben",
+u"Haus",
+u"Welt",
+u"Tag",
+u"Teil",
+u"Weg",
+u"Geld",
+u"Arbeit",
+u"Frage",
+u"viel",
+u"viele",
+u"vielen",
+u"kommt",
+u"kommen",
+u"machen",
+u"gemacht",
+u"Seite",
+u"neu",
+u"groß",
+u"große",
+u"großen",
+u"alten",
+u"letzten",
+u"zweiten",
+u"steht",
+u"stehen",
+u"weiter",
+u"eigenen",
+u"lassen",
+u"lässt",
+u"ganz",
+u"lange",
+u"lang",
+u"nie",
+]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import math
+import os
+import re
+import struct
+import zlib
+
+
+class BloomFilter(object):
+    """
+    Bloom filter over the folded lexicon keys, answers "definitely not in lexicon" without walking the dafsa.
+    Keys are folded so that all spellings the lookups accept fall onto the same key: lower case, ä/ö/ü -> a/o/u, ß -> ss and
+    ae/oe/ue -> a/o/u. Hence a word rejected by the filter has no spelling variant in the lexicon either.
+    Bit positions come from stable checksums of the UTF-8 key, CRC-32 and Adler-32, so that a filter can be saved and loaded.
+    File layout: magic, number of hash functions, number of bits, number of keys, bit array. Integers are little-endian.
+    """
+    __slots__ = ["bits", "num_bits", "num_hashes", "num_keys"]
+
+    #Version 2, hashes of version 1 filters were SHA-1 based
+    MAGIC = b"DMB2"
+    HEADER = struct.Struct(str("<4sIQQ"))
+
+    FOLD_CHARS = ((u"ä", u"a"), (u"ö", u"o"), (u"ü", u"u"), (u"ß", u"ss"))
+    #Any number of e's, so that folding commutes with replacing a single ue by ü e.g. uee, üe -> u
+    FOLD_PAIRS = re.compile(u"([aou])e+")
+
+    #Number of set bits of every byte value
+    POPCOUNT = bytearray(bin(byte).count("1") for byte in range(256))
+
+    def __init__(self, bits=None, num_hashes=0, num_keys=0):
+        self.bits = bits if bits is not None else bytearray(8)
+        self.num_bits = len(self.bits) * 8
+        self.num_hashes = num_hashes
+        self.num_keys = num_keys
+
+    @classmethod
+    def build(cls, keys, error_rate=0.01):
+        """
+        Build a filter sized for the given error rate
+        Args:
+            keys: iterable of lexicon words
+            error_rate: aimed false positive rate
+        Returns:
+            BloomFilter object
+        """
+        folded = set(cls.fold(key) for key in keys)
+        num_keys = max(len(folded), 1)
+        num_bits = int(math.ceil(-num_keys * math.log(error_rate) / math.log(2) ** 2))
+        num_bytes = (num_bits + 7) // 8
+        num_hashes = max(1, int(round(num_bytes * 8.0 / num_keys * math.log(2))))
+
+        bloom_filter = cls(bytearray(num_bytes), num_hashes, len(folded))
+        for key in folded:
+            bloom_filter._add(key)
+        return bloom_filter
+
+    @classmethod
+    def fold(cls, word):
+        """
+        Fold word onto its filter key, e.g. Strasse, Straße -> strasse and Müller, Mueller, Muller -> muller
+        """
+        key = word.lower()
+        for (char, folded) in cls.FOLD_CHARS:
+            if char in key:
+                key = key.replace(char, folded)
+        #Most words have no pair, checking is cheaper than substituting
+        if u"ae" in key or u"oe" in key or u"ue" in key:
+            key = cls.FOLD_PAIRS.sub(u"\\1", key)
+        return key
+
+    def _hashes(self, key):
+        """
+        Two hashes of the key, bit positions are first + i * second for i < num_hashes
+        """
+        data = key.encode("utf-8")
+        return zlib.crc32(data) & 0xffffffff, zlib.adler32(data) | 1
+
+    def _add(self, key):
+        bits = self.bits
+        pos, step = self._hashes(key)
+        for x in range(self.num_hashes):
+            pos = (pos + step) % self.num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, word):
+        """
+        Return False if no spelling variant of the word is in lexicon, True if it may be
+        Most unknown words are rejected by one of the first bits, positions are computed only upto there.
+        """
+        bits = self.bits
+        num_bits = self.num_bits
+        #_hashes inlined, a method call costs as much as the checksums
+        data = self.fold(word).encode("utf-8")
+        pos, step = zlib.crc32(data) & 0xffffffff, zlib.adler32(data) | 1
+        for x in range(self.num_hashes):
+            pos = (pos + step) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self):
+        """Memory of the bit array in bytes"""
+        return len(self.bits)
+
+    @property
+    def false_positive_rate(self):
+        """
+        Expected false positive rate, probability that all bits of an unknown word are set
+        """
+        fill = float(sum(self.bits.translate(self.POPCOUNT))) / self.num_bits
+        return fill ** self.num_hashes
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.num_hashes, self.num_bits, self.num_keys))
+            f.write(self.bits)
+
+    def load(self, path):
+        """
+        Read filter file at path
+        Returns:
+            BloomFilter object itself
+        Raises:
+            ValueError if file is not a Bloom filter
+        """
+        with open(path, "rb") as f:
+            header = f.read(self.HEADER.size)
+            if len(header) < self.HEADER.size or header[:len(self.MAGIC)] != self.MAGIC:
+                raise ValueError("%s is not a Bloom filter" % path)
+            magic, self.num_hashes, self.num_bits, self.num_keys = self.HEADER.unpack(header)
+            self.bits = bytearray(f.read())
+        if len(self.bits) * 8 != self.num_bits:
+            raise ValueError("%s is truncated" % path)
+        return self
+
+
+if __name__ == "__main__":
+    #Build the filter from the lexicon in the data folder
+    from demorphy.morph_dict.dictionary import Dictionary
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    BloomFilter.build(Dictionary(data_path).dafsa.iterkeys()).save(os.path.join(data_path, "words.bloom"))
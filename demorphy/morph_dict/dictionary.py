@@ -2,37 +2,73 @@
 
 from __future__ import absolute_import, unicode_literals
 
-from demorphy.morph_dict.load_dicts import load_dicts
+import hashlib
+import os
+
+from demorphy.morph_dict.load_dicts import load_dicts, load_form_index, load_tag_index
 
 
 class Dictionary(object):
     """
-    Dictionary build on dawg, lemma list and paradigm list
+    Dictionary build on dawg, lemma table and paradigm list
     """
-    __slots__ = ["lang", "_dicts", "dafsa", "lemma_list", "path", "paradigm_list"]
+    __slots__ = ["lang", "_dicts", "dafsa", "lemma_list", "path", "paradigm_list", "paradigm_table", "suffix_index", "form_index", "tag_index", "bloom_filter", "_fingerprint"]
+
+    #Data files analyses are read from, the paradigm list is hashed too
+    FINGERPRINT_FILES = ("words.dg", "lemmas.dat", "lemmas.py", "suffixes.dg")
 
-    def __init__(self, path):
+    def __init__(self, path, mmap=False, bloom=False):
 
-        self._dicts = load_dicts(path)
+        self._dicts = load_dicts(path, mmap=mmap, bloom=bloom)
 
         self.lang = "DE_de"
         self.dafsa = self._dicts.words
         self.lemma_list = self._dicts.lemmas
         self.paradigm_list = self._dicts.paradigms
+        self.paradigm_table = self._dicts.paradigm_table
+        self.suffix_index = self._dicts.suffix_index
+        self.bloom_filter = self._dicts.bloom_filter
+        #Loaded on first generation and tag query requests
+        self.form_index = None
+        self.tag_index = None
+        self._fingerprint = None
 
         self.path = path
 
+    def fingerprint(self):
+        """
+        Identify the data this dictionary analyzes with, i.e. size and modification time of the words dafsa, lemma table
+        and suffix index files and the paradigm list. It changes whenever a rebuilt or updated dictionary may give
+        different analyses. Files are only stat'ed, not read.
+        Returns:
+            hex digest string
+        Raises:
+            None
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for file_name in self.FINGERPRINT_FILES:
+                file_path = os.path.join(self.path, file_name)
+                if os.path.exists(file_path):
+                    stat = os.stat(file_path)
+                    digest.update((u"%s %d %r\n" % (file_name, stat.st_size, stat.st_mtime)).encode("utf-8"))
+                else:
+                    digest.update((u"%s missing\n" % file_name).encode("utf-8"))
+            digest.update(u"\n".join(self.paradigm_list).encode("utf-8"))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
     def find_paradigm_lemma_id(self, word):
         """
-        Given word, find all (lemmaid, paradigmid) pairs
+        Given word, find all (lemmaid, paradigmid) pairs. Exact spelling only.
         Args:
             word: unicode string
         Returns:
-            list of tuples
+            list of tuples, empty list if word is not in dafsa
         Raises:
             None
         """
-        para_lemma_ids_list = self.dafsa[word]
+        para_lemma_ids_list = self.dafsa.get(word, [])
         return para_lemma_ids_list
 
     def lookup_paradigm(self, para_id):
@@ -48,9 +84,21 @@ class Dictionary(object):
         paradigm_str = self.paradigm_list[para_id]
         return paradigm_str
 
+    def lookup_paradigm_features(self, para_id):
+        """
+        Given paradigm id, find the parsed paradigm
+        Args:
+            para_id: integer
+        Returns:
+            Paradigm object
+        Raises:
+            None
+        """
+        return self.paradigm_table[para_id]
+
     def lookup_lemma(self, lemma_id):
         """
-        Given lemma id, find the paradigm string
+        Given lemma id, find the lemma string. Only this lemma is decoded from the lemma table.
         Args:
             lemma_id: integer
         Returns:
@@ -61,14 +109,113 @@ class Dictionary(object):
         lemma = self.lemma_list[lemma_id]
         return lemma
 
+    def guess_paradigm_lemma(self, word):
+        """
+        Guess (lemma, paradigm id) pairs of an unknown word from the suffix index
+        Args:
+            word: unicode string
+        Returns:
+            list of tuples, most frequent first. Empty list if there's no suffix index or no known ending.
+        Raises:
+            None
+        """
+        if self.suffix_index is None:
+            return []
+        return self.suffix_index.guess(word)
+
+    def find_forms(self, lemma):
+        """
+        Given lemma, find all its inflected forms from the form index. Index is loaded on first call.
+        Args:
+            lemma: unicode string
+        Returns:
+            list of (form, paradigm id) pairs, empty list if lemma is not in lexicon
+        Raises:
+            IOError if the form index wasn't built
+        """
+        if self.form_index is None:
+            self.form_index = load_form_index(self.path)
+        return self.form_index.forms(lemma)
+
+    def find_paradigm_ids(self, tags):
+        """
+        Given tags, find ids of all paradigms having all of them
+        Args:
+            tags: iterable of tags, e.g. (u"NN", u"gen", u"plu")
+        Returns:
+            list of paradigm ids
+        Raises:
+            None
+        """
+        tags = frozenset(tags)
+        return [para_id for para_id, paradigm in enumerate(self.paradigm_table) if tags <= paradigm.tags]
+
+    def find_word_ids(self, tags):
+        """
+        Given tags, find ids of the words having an analysis with all of them. Only postings of the matching paradigms are read.
+        Tag index is loaded on first call.
+        Args:
+            tags: iterable of tags
+        Returns:
+            set of word ids
+        Raises:
+            IOError if the tag index wasn't built
+        """
+        if self.tag_index is None:
+            self.tag_index = load_tag_index(self.path)
+        word_ids = set()
+        for para_id in self.find_paradigm_ids(tags):
+            word_ids.update(self.tag_index.word_ids(para_id))
+        return word_ids
+
+    def lookup_word(self, word_id):
+        """
+        Given word id of the tag index, find the word
+        Args:
+            word_id: integer
+        Returns:
+            word string
+        Raises:
+            IOError if the tag index wasn't built
+        """
+        if self.tag_index is None:
+            self.tag_index = load_tag_index(self.path)
+        return self.tag_index.word(word_id)
+
+    def find_prefix_words(self, word):
+        """
+        Find all lexicon words which are prefixes of the given word, in a single walk over the dafsa
+        Args:
+            word: unicode string
+        Returns:
+            list of words, shortest first
+        Raises:
+            None
+        """
+        return self.dafsa.prefixes(word)
+
+    def maybe_known(self, word):
+        """
+        Check the Bloom filter, if there's one
+        Args:
+            word: unicode string
+        Returns:
+            False if no spelling variant of the word is in lexicon, True if there may be one
+        Raises:
+            None
+        """
+        return self.bloom_filter is None or word in self.bloom_filter
+
     def is_known(self, word, char_substitutes={}):
         """
         Check if a word is in lexicon
+        The Bloom filter isn't checked, both lookups run in the dafsa extension and cost less than folding and hashing the word.
         """
-        if char_substitutes:
-            return bool(self.dafsa.similar_keys(word, char_substitutes))
-        else:
-            return word in self.dafsa
+        if word in self.dafsa:
+            return True
+        if not char_substitutes:
+            return False
+        return bool(self.dafsa.similar_keys(word, char_substitutes))
 
     def find_similar_words(self, word, char_substitutes={}):
         """
@@ -84,6 +231,59 @@ class Dictionary(object):
         words = self.dafsa.similar_keys(word, char_substitutes)
         return words
 
+    @staticmethod
+    def compile_spelling_substitutes(mapping):
+        """
+        Compile spelling substitutes for find_spelling_variant. Unlike DAWG char substitutes, both sides can be several characters long.
+        Args:
+            mapping: dictionary of replacements e.g. {"ss": "ß", "ue": "ü"}
+        Returns:
+            dictionary, first char of the replaced string to (replaced, replacement) pairs
+        """
+        substitutes = {}
+        for source, target in mapping.items():
+            substitutes.setdefault(source[0], []).append((source, target))
+        return dict((char, tuple(sorted(pairs, key=lambda pair: -len(pair[0])))) for char, pairs in substitutes.items())
+
+    def find_spelling_variant(self, word, spelling_substitutes, case_fold=False):
+        """
+        Find a lexicon word which is spelled like the given word upto the spelling substitutes, e.g. Strasse -> Straße.
+        Every occurence is substituted or kept independently. All candidates are explored in a single depth first walk,
+        a branch is cut as soon as its prefix doesn't begin any lexicon word.
+        Args:
+            word: unicode string
+            spelling_substitutes: compiled by compile_spelling_substitutes
+            case_fold: Boolean. If True, case of the first letter is swapped as well, e.g. strasse -> Straße
+        Returns:
+            first found variant with at least one substitution, None if there's no such word
+        Raises:
+            None
+        """
+        has_keys_with_prefix = self.dafsa.has_keys_with_prefix
+        end = len(word)
+        stack = [(0, u"")]
+        while stack:
+            pos, prefix = stack.pop()
+            if pos == end:
+                if prefix != word and prefix in self.dafsa:
+                    return prefix
+                continue
+
+            char = word[pos]
+            branches = [(pos + 1, prefix + char)]
+            if case_fold and pos == 0 and char.swapcase() != char:
+                branches.append((1, char.swapcase()))
+            for source, target in spelling_substitutes.get(char, ()):
+                if word.startswith(source, pos):
+                    branches.append((pos + len(source), prefix + target))
+
+            #Pushed in reverse, so that keeping the char is explored first
+            for next_pos, next_prefix in reversed(branches):
+                if has_keys_with_prefix(next_prefix):
+                    stack.append((next_pos, next_prefix))
+
+        return None
+
     def iter_lexicon(self, prefix=u""):
         """
         Iterate over all lexicon, on demand by all words beginning with a given prefix.
@@ -93,6 +293,17 @@ class Dictionary(object):
         Yields:
             (word, paradigm, lemma)  tuples
         """
-        for word, (lemma_id, para_id) in self.dafsa.iteritems(prefix):
+        for word, lemma_id, para_id in self.iter_lexicon_ids(prefix):
             paradigm, lemma = self.lookup_paradigm(para_id), self.lookup_lemma(lemma_id)
             yield word, paradigm, lemma
+
+    def iter_lexicon_ids(self, prefix=u""):
+        """
+        Iterate over all lexicon like iter_lexicon, without looking up lemmas and paradigms.
+        Args:
+            prefix: unicode string, default empty string
+        Yields:
+            (word, lemma id, paradigm id)  tuples
+        """
+        for word, (lemma_id, para_id) in self.dafsa.iteritems(prefix):
+            yield word, lemma_id, para_id
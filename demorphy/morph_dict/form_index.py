@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import os
+import struct
+
+from demorphy.dafsa import BytesDAWG
+
+
+class FormIndex(object):
+    """
+    Reverse index of the lexicon for generation, maps each lemma to all of its inflected forms.
+    Lemmas are keys of a dag, every (form, paradigm id) pair of the lemma is a value of its key.
+    Homograph lemmas with different lemma ids share their key.
+    """
+    __slots__ = ["dafsa"]
+
+    #Paradigm id. Form follows as UTF-8
+    FORM = struct.Struct(str(">H"))
+
+    def __init__(self, dafsa=None):
+        self.dafsa = dafsa
+
+    @classmethod
+    def build(cls, dictionary):
+        """
+        Walk the lexicon once and collect forms of every lemma
+        Args:
+            dictionary: Dictionary object
+        Returns:
+            FormIndex object
+        """
+        items = []
+        for word, lemma_id, para_id in dictionary.iter_lexicon_ids():
+            items.append((dictionary.lookup_lemma(lemma_id), cls.FORM.pack(para_id) + word.encode("utf-8")))
+        return cls(BytesDAWG(items))
+
+    def forms(self, lemma):
+        """
+        Find inflected forms of a lemma
+        Args:
+            lemma: unicode string, lemma as in lexicon
+        Returns:
+            list of (form, paradigm id) pairs, sorted by form. Empty list if lemma is unknown
+        """
+        forms = []
+        for value in self.dafsa.get(lemma, []):
+            forms.append((value[self.FORM.size:].decode("utf-8"), self.FORM.unpack_from(value)[0]))
+        forms.sort()
+        return forms
+
+    def save(self, path):
+        self.dafsa.save(path)
+
+    def load(self, path):
+        self.dafsa = BytesDAWG().load(path)
+        return self
+
+
+if __name__ == "__main__":
+    #Build the index from the lexicon in the data folder
+    from demorphy.morph_dict.dictionary import Dictionary
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    FormIndex.build(Dictionary(data_path)).save(os.path.join(data_path, "forms.dg"))
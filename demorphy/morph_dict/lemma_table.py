@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import mmap
+import struct
+
+
+class LemmaTable(object):
+    """
+    Read-only lemma list, stored as an offset array and a UTF-8 blob in a memory mapped file.
+    Lemmas are decoded only when they're looked up.
+    File layout: magic, number of lemmas, number of lemmas + 1 offsets into the blob, blob. Integers are little-endian uint32.
+    """
+    __slots__ = ["_mmap", "_size", "_blob_start"]
+
+    MAGIC = b"DMLT"
+    HEADER = struct.Struct(str("<4sI"))
+    OFFSET = struct.Struct(str("<I"))
+    OFFSET_PAIR = struct.Struct(str("<II"))
+
+    def __init__(self):
+        self._mmap = None
+        self._size = 0
+        self._blob_start = 0
+
+    def load(self, path):
+        """
+        Map lemma table file at path
+        Args:
+            path: path of the table file
+        Returns:
+            LemmaTable object itself
+        Raises:
+            ValueError if file is not a lemma table
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < self.HEADER.size or self._mmap[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("%s is not a lemma table" % path)
+        self._size = self.HEADER.unpack_from(self._mmap, 0)[1]
+        self._blob_start = self.HEADER.size + self.OFFSET.size * (self._size + 1)
+        return self
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, lemma_id):
+        """
+        Given lemma id, decode the lemma
+        Args:
+            lemma_id: integer
+        Returns:
+            lemma string
+        Raises:
+            IndexError if there's no such lemma
+        """
+        if not 0 <= lemma_id < self._size:
+            raise IndexError("lemma id out of range")
+        start, end = self.OFFSET_PAIR.unpack_from(self._mmap, self.HEADER.size + self.OFFSET.size * lemma_id)
+        return self._mmap[self._blob_start + start:self._blob_start + end].decode("utf-8")
+
+    def __iter__(self):
+        for lemma_id in range(self._size):
+            yield self[lemma_id]
+
+    @classmethod
+    def build(cls, lemmas, path):
+        """
+        Write lemmas, in lemma id order, to a lemma table file
+        Args:
+            lemmas: iterable of lemma strings
+            path: path of the table file
+        """
+        offsets = [0]
+        blob = bytearray()
+        for lemma in lemmas:
+            blob += lemma.encode("utf-8")
+            offsets.append(len(blob))
+
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(offsets) - 1))
+            f.write(struct.pack(str("<%dI" % len(offsets)), *offsets))
+            f.write(blob)
+
+
+if __name__ == "__main__":
+    #Convert lemma list of the former lemmas module to data/lemmas.dat
+    import os
+    from demorphy.data.lemmas import lemmas
+    LemmaTable.build(lemmas, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "lemmas.dat"))
@@ -2,33 +2,160 @@ from __future__ import absolute_import, unicode_literals
 
 import os
 import collections
+import threading
 
 from demorphy import dafsa
-from demorphy.data import lemmas, paradigms
+from demorphy.data import paradigms
+from demorphy.morph_dict.bloom_filter import BloomFilter
+from demorphy.morph_dict.form_index import FormIndex
+from demorphy.morph_dict.lemma_table import LemmaTable
+from demorphy.morph_dict.suffix_index import SuffixIndex
+from demorphy.morph_dict.tag_index import TagIndex
+from demorphy.tagset import Paradigm
+
+#Guards loading of the module globals below, so that threads don't load them twice or see them half loaded
+_LOCK = threading.Lock()
 
 WORDS = None
+MAPPED_WORDS = None
+LEMMAS = None
+PARADIGM_TABLE = None
+SUFFIX_INDEX = None
+BLOOM_FILTER = None
+FORM_INDEX = None
+TAG_INDEX = None
 LoadedDict = collections.namedtuple("LoadedDict", [
     'words',
     "lemmas",
     'paradigms',
+    'paradigm_table',
+    'suffix_index',
+    'bloom_filter',
 ])
 
 
-def load_dicts(path):
+def load_dicts(path, mmap=False, bloom=False):
     """
-    Load words dafsa from its dump, lemmas list and paradigms list
-    path points to the data folder where words dafsa was dumped
+    Load words dafsa from its dump, lemma table and paradigms list. Paradigms are parsed into Paradigm objects once.
+    Suffix index of the guesser is optional, it's loaded only if it was built into the data folder.
+    Bloom filter over the words is optional too, it's loaded if it was built into the data folder, otherwise built from the dafsa.
+    path points to the data folder where words dafsa and lemma table were dumped
     Args:
         path: directory where dafsa, lemma and paradigm list lies
+        mmap: Boolean. If True, dafsa is memory mapped read-only instead of being read into the process heap.
+              Mapped pages are shared between processes, e.g. web server workers.
+        bloom: Boolean. If True, Bloom filter of the words is loaded, else it's None
     Returns:
-        A LoadedDict object, basicly tuple of dafsa, lemma list and paradigm list
+        A LoadedDict object, basicly tuple of dafsa, lemma list, paradigm list, parsed paradigm list, suffix index and Bloom filter
+    Loaded objects are read-only and shared by all dictionaries, loading them is serialized by a module lock.
     """
-    global WORDS
-    if not WORDS:
-        WORDS = dafsa.LexiconDawg().load(os.path.join(path, "words.dg"))
+    global WORDS, MAPPED_WORDS, LEMMAS, PARADIGM_TABLE, SUFFIX_INDEX, BLOOM_FILTER
+    with _LOCK:
+        if mmap:
+            if MAPPED_WORDS is None:
+                MAPPED_WORDS = dafsa.MappedLexiconDawg().load(os.path.join(path, "words.dg"))
+            words = MAPPED_WORDS
+        else:
+            if WORDS is None:
+                WORDS = dafsa.LexiconDawg().load(os.path.join(path, "words.dg"))
+            words = WORDS
+
+        if LEMMAS is None:
+            LEMMAS = load_lemmas(path)
+
+        if PARADIGM_TABLE is None:
+            PARADIGM_TABLE = [Paradigm(paradigm_str) for paradigm_str in paradigms]
+
+        suffix_path = os.path.join(path, "suffixes.dg")
+        if SUFFIX_INDEX is None and os.path.exists(suffix_path):
+            SUFFIX_INDEX = SuffixIndex().load(suffix_path)
+
+        if bloom and BLOOM_FILTER is None:
+            bloom_path = os.path.join(path, "words.bloom")
+            if os.path.exists(bloom_path):
+                try:
+                    BLOOM_FILTER = BloomFilter().load(bloom_path)
+                except ValueError:
+                    #Filter of an older format, its bit positions don't match
+                    BLOOM_FILTER = None
+            if BLOOM_FILTER is None:
+                BLOOM_FILTER = BloomFilter.build(words.iterkeys())
 
     return LoadedDict(
-        words=WORDS,
-        lemmas=lemmas,
+        words=words,
+        lemmas=LEMMAS,
         paradigms=paradigms,
+        paradigm_table=PARADIGM_TABLE,
+        suffix_index=SUFFIX_INDEX,
+        bloom_filter=BLOOM_FILTER if bloom else None,
     )
+
+
+def load_lemmas(path):
+    """
+    Load lemma table of the data folder. If there's no table but the former lemma list module is installed, the table is
+    built from the list once. If the data folder isn't writable, the list itself is used.
+    Args:
+        path: directory where the lemma table lies
+    Returns:
+        LemmaTable object, or list of lemmas
+    Raises:
+        IOError if there's neither lemma table nor lemma list
+    """
+    lemma_path = os.path.join(path, "lemmas.dat")
+    if not os.path.exists(lemma_path):
+        try:
+            from demorphy.data.lemmas import lemmas
+        except ImportError:
+            raise IOError("%s not found, build it with python -m demorphy.morph_dict.lemma_table" % lemma_path)
+        #Written next to the table and renamed, other processes never see a partial table
+        tmp_path = "%s.%d.tmp" % (lemma_path, os.getpid())
+        try:
+            LemmaTable.build(lemmas, tmp_path)
+            os.rename(tmp_path, lemma_path)
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if not os.path.exists(lemma_path):
+                return lemmas
+    return LemmaTable().load(lemma_path)
+
+
+def load_form_index(path):
+    """
+    Load lemma to forms index of generation. It's not part of load_dicts, analysis doesn't need it.
+    Args:
+        path: directory where the index was built into
+    Returns:
+        FormIndex object
+    Raises:
+        IOError if the index wasn't built
+    """
+    global FORM_INDEX
+    with _LOCK:
+        if FORM_INDEX is None:
+            form_path = os.path.join(path, "forms.dg")
+            if not os.path.exists(form_path):
+                raise IOError("%s not found, build it with python -m demorphy.morph_dict.form_index" % form_path)
+            FORM_INDEX = FormIndex().load(form_path)
+    return FORM_INDEX
+
+
+def load_tag_index(path):
+    """
+    Load paradigm to words inverted index. It's not part of load_dicts, analysis doesn't need it.
+    Args:
+        path: directory where the index was built into
+    Returns:
+        TagIndex object
+    Raises:
+        IOError if the index wasn't built
+    """
+    global TAG_INDEX
+    with _LOCK:
+        if TAG_INDEX is None:
+            postings_path = os.path.join(path, TagIndex.POSTINGS_FILE)
+            if not os.path.exists(postings_path):
+                raise IOError("%s not found, build it with python -m demorphy.morph_dict.tag_index" % postings_path)
+            TAG_INDEX = TagIndex().load(path)
+    return TAG_INDEX
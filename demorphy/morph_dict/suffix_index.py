@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import os
+import struct
+
+from demorphy.dafsa import BytesDAWG
+
+
+class SuffixIndex(object):
+    """
+    Statistical guesser index, derived from the lexicon.
+    Maps each word ending (upto max_suffix_len chars) to its most frequent paradigm ids together with lemma rewrite rules.
+    A rewrite rule cuts strip chars from the end of the word and appends a lemma ending, e.g. Hauses -> Haus is (2, "").
+    Endings are stored reversed in a dag, so that the longest known ending of a word is found by a single prefix probe.
+    """
+    __slots__ = ["dafsa"]
+
+    #Paradigm id, frequency, number of chars to strip. Lemma ending follows as UTF-8
+    RULE = struct.Struct(str(">HIB"))
+
+    OPEN_CATEGORIES = frozenset(["NN", "ADJ", "V", "ADV"])
+
+    def __init__(self, dafsa=None):
+        self.dafsa = dafsa
+
+    @classmethod
+    def build(cls, dictionary, max_suffix_len=5, max_rules=10, min_count=2):
+        """
+        Walk the lexicon once and count paradigm and lemma rule frequencies of all word endings of open class words.
+        Args:
+            dictionary: Dictionary object
+            max_suffix_len: longest ending to index
+            max_rules: number of most frequent (paradigm, rule) pairs to keep per ending
+            min_count: pairs seen less often are dropped
+        Returns:
+            SuffixIndex object
+        """
+        open_paradigms = frozenset(para_id for para_id, paradigm in enumerate(dictionary.paradigm_table)
+                                   if paradigm.category in cls.OPEN_CATEGORIES)
+        counts = collections.defaultdict(collections.Counter)
+
+        for word, lemma_id, para_id in dictionary.iter_lexicon_ids():
+            if para_id not in open_paradigms:
+                continue
+            lemma = dictionary.lookup_lemma(lemma_id)
+            strip, lemma_ending = cls.lemma_rule(word, lemma)
+            #Rule must only touch the ending, otherwise it doesn't carry over to other words with the same ending
+            for suffix_len in range(max(strip, 1), min(max_suffix_len, len(word) - 1) + 1):
+                counts[word[-suffix_len:][::-1]][(para_id, strip, lemma_ending)] += 1
+
+        items = []
+        for rev_suffix, rules in counts.items():
+            for (para_id, strip, lemma_ending), count in rules.most_common(max_rules):
+                if count >= min_count and strip < 256:
+                    items.append((rev_suffix, cls.RULE.pack(para_id, count, strip) + lemma_ending.encode("utf-8")))
+
+        return cls(BytesDAWG(items))
+
+    @staticmethod
+    def lemma_rule(word, lemma):
+        """
+        Rewrite rule turning the word into the lemma
+        Returns:
+            (number of chars to strip from the word, ending to append) pair
+        """
+        common = 0
+        for (word_char, lemma_char) in zip(word, lemma):
+            if word_char != lemma_char:
+                break
+            common += 1
+        return len(word) - common, lemma[common:]
+
+    def guess(self, word):
+        """
+        Guess analyses of an unknown word from its longest indexed ending
+        Args:
+            word: unicode string
+        Returns:
+            list of (lemma, paradigm id) pairs, most frequent first. Empty list if no ending is known
+        """
+        rev_suffixes = self.dafsa.prefixes(word[::-1])
+        if not rev_suffixes:
+            return []
+
+        rules = []
+        for value in self.dafsa[rev_suffixes[-1]]:
+            para_id, count, strip = self.RULE.unpack_from(value)
+            rules.append((count, para_id, strip, value[self.RULE.size:].decode("utf-8")))
+        rules.sort(key=lambda rule: -rule[0])
+
+        return [(word[:len(word) - strip] + lemma_ending, para_id) for (count, para_id, strip, lemma_ending) in rules]
+
+    def save(self, path):
+        self.dafsa.save(path)
+
+    def load(self, path):
+        self.dafsa = BytesDAWG().load(path)
+        return self
+
+
+if __name__ == "__main__":
+    #Build the index from the lexicon in the data folder
+    from demorphy.morph_dict.dictionary import Dictionary
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    SuffixIndex.build(Dictionary(data_path)).save(os.path.join(data_path, "suffixes.dg"))
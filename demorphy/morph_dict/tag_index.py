@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import array
+import mmap
+import os
+import struct
+import sys
+
+from demorphy.morph_dict.lemma_table import LemmaTable
+
+
+class TagIndex(object):
+    """
+    Inverted index of the lexicon, maps each paradigm id to the sorted ids of the words having an analysis with this paradigm.
+    Word ids are positions of the words in the lexicon order, words themselves are kept in a string table.
+    Tag queries are answered on the paradigm list first, then only postings of the matching paradigms are read.
+    Postings file layout: magic, number of paradigms, number of paradigms + 1 offsets into the postings, postings.
+    Integers are little-endian uint32, both files are memory mapped.
+    """
+    __slots__ = ["_mmap", "_size", "_postings_start", "words"]
+
+    MAGIC = b"DMTI"
+    HEADER = struct.Struct(str("<4sI"))
+    OFFSET = struct.Struct(str("<I"))
+    OFFSET_PAIR = struct.Struct(str("<II"))
+
+    POSTINGS_FILE = "tags.dat"
+    WORDS_FILE = "wordlist.dat"
+
+    def __init__(self):
+        self._mmap = None
+        self._size = 0
+        self._postings_start = 0
+        self.words = None
+
+    @classmethod
+    def build(cls, dictionary, path):
+        """
+        Walk the lexicon once and write word list and postings of all paradigms into the folder path
+        Args:
+            dictionary: Dictionary object
+            path: directory to write the index files
+        """
+        words = []
+        postings = [array.array(str("I")) for paradigm in dictionary.paradigm_table]
+        for word, lemma_id, para_id in dictionary.iter_lexicon_ids():
+            if not words or words[-1] != word:
+                words.append(word)
+            word_postings = postings[para_id]
+            #Same word with the same paradigm under several lemmas
+            if not word_postings or word_postings[-1] != len(words) - 1:
+                word_postings.append(len(words) - 1)
+
+        LemmaTable.build(words, os.path.join(path, cls.WORDS_FILE))
+
+        offsets = [0]
+        for word_postings in postings:
+            offsets.append(offsets[-1] + len(word_postings))
+        with open(os.path.join(path, cls.POSTINGS_FILE), "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(postings)))
+            f.write(struct.pack(str("<%dI" % len(offsets)), *offsets))
+            for word_postings in postings:
+                if sys.byteorder == "big":
+                    word_postings.byteswap()
+                f.write(word_postings.tostring() if sys.version_info[0] < 3 else word_postings.tobytes())
+
+    def load(self, path):
+        """
+        Map index files in the folder path
+        Args:
+            path: directory of the index files
+        Returns:
+            TagIndex object itself
+        Raises:
+            ValueError if postings file is not a tag index
+        """
+        postings_path = os.path.join(path, self.POSTINGS_FILE)
+        with open(postings_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < self.HEADER.size or self._mmap[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("%s is not a tag index" % postings_path)
+        self._size = self.HEADER.unpack_from(self._mmap, 0)[1]
+        self._postings_start = self.HEADER.size + self.OFFSET.size * (self._size + 1)
+        self.words = LemmaTable().load(os.path.join(path, self.WORDS_FILE))
+        return self
+
+    def word_ids(self, para_id):
+        """
+        Given paradigm id, read its postings
+        Args:
+            para_id: integer
+        Returns:
+            array of word ids, sorted
+        Raises:
+            IndexError if there's no such paradigm
+        """
+        if not 0 <= para_id < self._size:
+            raise IndexError("paradigm id out of range")
+        start, end = self.OFFSET_PAIR.unpack_from(self._mmap, self.HEADER.size + self.OFFSET.size * para_id)
+        word_ids = array.array(str("I"))
+        chunk = self._mmap[self._postings_start + self.OFFSET.size * start:self._postings_start + self.OFFSET.size * end]
+        if sys.version_info[0] < 3:
+            word_ids.fromstring(chunk)
+        else:
+            word_ids.frombytes(chunk)
+        if sys.byteorder == "big":
+            word_ids.byteswap()
+        return word_ids
+
+    def word(self, word_id):
+        """
+        Given word id, decode the word
+        """
+        return self.words[word_id]
+
+
+if __name__ == "__main__":
+    #Build the index from the lexicon in the data folder
+    from demorphy.morph_dict.dictionary import Dictionary
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    TagIndex.build(Dictionary(data_path), data_path)
@@ -4,6 +4,40 @@ from __future__ import absolute_import, unicode_literals
 
 from collections import OrderedDict
 
+from demorphy.tagset import Paradigm
+
+#Paradigm string -> Paradigm object, shared by all suffix tables
+PARADIGMS = {}
+
+
+def compile_suffix_trie(suffix_table, lemma_ending):
+    """
+    Compile a suffix table into a trie of reversed suffixes, so that the longest matching suffix is found in one backward walk.
+    Terminal nodes keep (suffix length, lemma ending, paradigm strings) under the key None.
+    Args:
+        suffix_table: dictionary of suffix to paradigm string list
+        lemma_ending: string, lemma is the word stem plus this ending
+    Returns:
+        nested dictionaries
+    """
+    trie = {}
+    for (suff, paradigm_list) in suffix_table.items():
+        node = trie
+        for char in reversed(suff):
+            node = node.setdefault(char, {})
+        node[None] = (len(suff), lemma_ending, paradigm_list)
+    return trie
+
+
+def lookup_paradigm(paradigm_str):
+    """
+    Return the shared Paradigm object of a paradigm string, parse it if it's not seen before
+    """
+    paradigm = PARADIGMS.get(paradigm_str)
+    if paradigm is None:
+        paradigm = PARADIGMS[paradigm_str] = Paradigm(paradigm_str)
+    return paradigm
+
 
 class SuffixAnalyzer(object):
     """
@@ -42,9 +76,38 @@ class SuffixAnalyzer(object):
         ("end", ["ADJ,pos,<pred>", "ADJ,pos,<adv>", "V,ppres"])
         ])
 
+    VERB_GE_TRIE = compile_suffix_trie(VERB_GE, u"t")
+    VERB_ADJ_END_TRIE = compile_suffix_trie(VERB_ADJ_END, u"end")
+    VERB_END_TRIE = compile_suffix_trie(VERB_END, u"en")
+
     def __init__(self):
         pass
 
+    @staticmethod
+    def _longest_suffix(trie, word):
+        """
+        Walk the reversed suffix trie backwards over the word, return terminal data of the longest matching suffix or None
+        """
+        match = None
+        node = trie
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            match = node.get(None, match)
+        return match
+
+    @staticmethod
+    def _match_suffix(word):
+        match = None
+        if word.startswith(u"ge"):
+            match = SuffixAnalyzer._longest_suffix(SuffixAnalyzer.VERB_GE_TRIE, word)
+        if match is None:
+            match = SuffixAnalyzer._longest_suffix(SuffixAnalyzer.VERB_ADJ_END_TRIE, word)
+        if match is None:
+            match = SuffixAnalyzer._longest_suffix(SuffixAnalyzer.VERB_END_TRIE, word)
+        return match
+
     @staticmethod
     def guess_word_by_suffix(word):
         """
@@ -57,20 +120,9 @@ class SuffixAnalyzer(object):
             >>> SuffixAnalyzer.guess_word_by_suffix(u"grepend")
             ["ADJ,pos,<pred>", "ADJ,pos,<adv>", "V,ppres"]
         """
-        if word.startswith(u"ge"):
-            for (suff, paradigm_list) in SuffixAnalyzer.VERB_GE.items():
-                if word.endswith(suff):
-                    lemma = word[:-len(suff)] + u"t" 
-                    return lemma, paradigm_list
-
-        for (suff, paradigm_list) in SuffixAnalyzer.VERB_ADJ_END.items():
-            if word.endswith(suff):
-                lemma = word[:-len(suff)] + u"end" 
-                return lemma, paradigm_list
-
-        for (suff, paradigm_list) in SuffixAnalyzer.VERB_END.items():
-            if word.endswith(suff):
-                lemma = word[:-len(suff)] + u"en"
-                return lemma, paradigm_list
-
-        return None, []
+        match = SuffixAnalyzer._match_suffix(word)
+        if match is None:
+            return None, []
+
+        suff_len, lemma_ending, paradigm_list = match
+        return word[:-suff_len] + lemma_ending, paradigm_list
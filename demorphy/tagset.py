@@ -4,57 +4,121 @@ from __future__ import absolute_import, unicode_literals
 from collections import OrderedDict
 
 
-class ParsedResult(object):
+class Paradigm(object):
     """
-    Class for holding the result of morphologycal analysis.
+    Morphological features of a paradigm string. Paradigm strings are parsed once, then shared by all analyses.
     """
 
-    __slots__ = ["_lemma", "_guesser", "_paradigm_str", "_paradigm_list", "_gender",
-                 "_numerus", "_case", "_person", "_tense", "_mode", "_inflection",
-                 "_degree", "_starke", "_category", "_orto","_additional_attributes", "_fields"]
+    FIELDS = ("gender", "numerus", "case", "person", "tense", "mode", "inflection", "degree", "starke", "category",
+              "orto", "additional_attributes", "stts_tag", "ptb_tag")
+
+    __slots__ = ("paradigm_str", "tags", "fields") + FIELDS
 
-    def __init__(self, paradigm_str, lemma, guesser=False):
+    def __init__(self, paradigm_str):
         """
         For initializing data fields, intersect possible tagclasses to the paradigm string
         Args:
             paradigm_str: string. Morphological analysis string e.g. : "V,inf", "V,inf,zu", "V,ppast"
+        """
+        self.paradigm_str = paradigm_str
+        self.tags = frozenset(paradigm_str.split(","))
+        self.gender = self._initialize_field("GENDER")
+        self.numerus = self._initialize_field("NUMERUS")
+        self.case = self._initialize_field("CASE")
+        self.person = self._initialize_field("PERSON")
+        self.tense = self._initialize_field("TENSE")
+        self.mode = self._initialize_field("MODE")
+        self.inflection = self._initialize_field("INFLECTION")
+        self.degree = self._initialize_field("DEGREE")
+        self.starke = self._initialize_field("STARKE")
+        self.category = self._initialize_field("CATEGORY")
+        self.orto = self._initialize_field("ORTO")
+        self.additional_attributes = self._initialize_field("ATTRS")
+        self.stts_tag = self._find_stts_tag()
+        self.ptb_tag = self._find_ptb_tag()
+        self.fields = tuple((field.upper(), getattr(self, field)) for field in self.FIELDS if getattr(self, field))
+
+    def _initialize_field(self, field_identifier):
+        return ",".join(getattr(TagClass, field_identifier).intersection(self.tags))
+
+    def _find_stts_tag(self):
+        """
+        STTS tag of the word from category and additional attributes
+        """
+        tag_list = TagClass.STTS_REV.get(self.category)
+        tag = tag_list
+        try:
+            for attr,t in tag_list.items():
+                if attr in self.additional_attributes:
+                    tag = t
+                    break
+        except:
+            pass
+        return tag
+
+    def _find_ptb_tag(self):
+        """
+        PTB tag of the word from category and additional attributes
+        """
+        tag_list = TagClass.PTB_REV.get(self.category)
+        tag = tag_list
+        try:
+            for attr,t in tag_list.items():
+                if any(attr in cat for cat in  [self.additional_attributes, self.numerus, self.inflection, self.degree]):
+                    tag = t
+                    break
+        except:
+            pass
+        return tag
+
+    def __str__(self):
+        return self.paradigm_str
+
+    def __repr__(self):
+        return str(self)
+
+
+class ParsedResult(object):
+    """
+    Class for holding the result of morphologycal analysis.
+    """
+
+    __slots__ = ["_lemma", "_guesser", "_paradigm", "_fields"]
+
+    def __init__(self, paradigm, lemma, guesser=False):
+        """
+        Initialize result from the paradigm features and the lemma
+        Args:
+            paradigm: Paradigm object or string. Morphological analysis string e.g. : "V,inf", "V,inf,zu", "V,ppast"
             lemma: string. Lemma of the given analysis. Different paradigms might corrspond to different paradigms, since lemma is word category dependent.
             guesser: Boolean. Data field if morphological analysis comes from suffix analyzer unit.
         """
         self._lemma = lemma
         self._guesser = guesser
-        self._paradigm_str = paradigm_str
-        self._paradigm_list = set(self._paradigm_str.split(","))
-        self._gender = self._initialize_field("GENDER")
-        self._numerus = self._initialize_field("NUMERUS")
-        self._case = self._initialize_field("CASE")
-        self._person = self._initialize_field("PERSON")
-        self._tense = self._initialize_field("TENSE")
-        self._mode = self._initialize_field("MODE")
-        self._inflection = self._initialize_field("INFLECTION")
-        self._degree = self._initialize_field("DEGREE")
-        self._starke = self._initialize_field("STARKE")
-        self._category = self._initialize_field("CATEGORY")
-        self._orto = self._initialize_field("ORTO")
-        self._additional_attributes = self._initialize_field("ATTRS")
-        self._fields = self._instance_to_dict()
-
-    def _initialize_field(self, field_identifier):
-        field_value = getattr(TagClass, field_identifier).intersection(self._paradigm_list)
-        return field_value 
+        self._paradigm = paradigm if isinstance(paradigm, Paradigm) else Paradigm(paradigm)
+        self._fields = None
 
     def _instance_to_dict(self):
-        fields = dict((k,v) for k,v in ((prop.upper(), getattr(self, prop)) for prop in dir(self) if not prop.startswith("_")) if v)
-        return fields
+        """
+        Dictionary of all non-empty fields, keys in alphabetical order. Built on first use only.
+        """
+        if self._fields is None:
+            fields = list(self._paradigm.fields)
+            if self._lemma:
+                fields.append(("LEMMA", self._lemma))
+            if self._guesser:
+                fields.append(("GUESSER", self._guesser))
+            self._fields = dict(sorted(fields))
+        return self._fields
 
     def __str__(self):
-        return str(self._fields)
+        return str(self._instance_to_dict())
 
     def __repr__(self):
         return str(self)
 
     def __iter__(self):
-        return iter(self._fields)
+        return iter(self._instance_to_dict())
 
     @property
     def lemma(self):
@@ -62,51 +126,51 @@ class ParsedResult(object):
         
     @property
     def gender(self):
-        return ",".join(self._gender)
+        return self._paradigm.gender
 
     @property
     def numerus(self):
-        return ",".join(self._numerus)
+        return self._paradigm.numerus
 
     @property
     def case(self):
-        return ",".join(self._case)
+        return self._paradigm.case
 
     @property
     def person(self):
-        return ",".join(self._person)
+        return self._paradigm.person
 
     @property
     def tense(self):
-        return ",".join(self._tense)
+        return self._paradigm.tense
 
     @property
     def mode(self):
-        return ",".join(self._mode)
+        return self._paradigm.mode
 
     @property
     def inflection(self):
-        return ",".join(self._inflection)
+        return self._paradigm.inflection
 
     @property
     def degree(self):
-        return ",".join(self._degree)
+        return self._paradigm.degree
 
     @property
     def category(self):
-        return  ",".join(self._category)
+        return self._paradigm.category
 
     @property
     def starke(self):
-        return  ",".join(self._starke)
+        return self._paradigm.starke
         
     @property
     def orto(self):
-        return  ",".join(self._orto)
+        return self._paradigm.orto
 
     @property
     def additional_attributes(self):
-        return ",".join(self._additional_attributes)
+        return self._paradigm.additional_attributes
 
     @property
     def guesser(self):
@@ -117,32 +181,14 @@ class ParsedResult(object):
         """
         STTS tag of the word from category and additional attributes
         """
-        tag_list = TagClass.STTS_REV[self.category]
-        tag = tag_list
-        try:
-            for attr,t in tag_list.items():
-                if attr in self.additional_attributes:
-                    tag = t
-                    break
-        except:
-            pass
-        return tag
+        return self._paradigm.stts_tag
 
     @property
     def ptb_tag(self):
         """
         PTB tag of the word from category and additional attributes
         """
-        tag_list = TagClass.PTB_REV[self.category]
-        tag = tag_list
-        try:
-            for attr,t in tag_list.items():
-                if any(attr in cat for cat in  [self.additional_attributes, self.numerus, self.inflection, self.degree]):
-                    tag = t
-                    break
-        except:
-            pass
-        return tag
+        return self._paradigm.ptb_tag
     
     def __contains__(self, tags):
         """
@@ -167,10 +213,10 @@ class ParsedResult(object):
 
         #{'NN', 'sing'} in tag
         if isinstance(tags, (set, frozenset)):
-            if tags <= self._paradigm_list:
+            if tags <= self._paradigm.tags:
                 return True
         #'APZR' in tag    
-        if tags in self._paradigm_list:
+        if tags in self._paradigm.tags:
             return True
 
         return False
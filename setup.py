@@ -14,6 +14,10 @@ install_requires = [
     "dawg (>= 0.7.8)"
 ] 
 
+extras_require = {
+    "mmap": ["DAWG-Python (>= 0.7.2)"],
+}
+
 
 setup(
     name="demorphy",
@@ -35,6 +39,7 @@ setup(
     requires=["dawg (>= 0.7.8)"],
     tests_require=tests_requires,
     install_requires=install_requires,
+    extras_require=extras_require,
     test_suite="tests",
     zip_safe=False,
     include_package_data=True,
@@ -12,3 +12,30 @@ def analyzer():
 def Tag(morph):
     import demorphy
     return demorphy.TagClass
+
+
+class LexiconStub(object):
+    """Just enough of Dictionary for building an index"""
+
+    def __init__(self, entries, lemmas=(), paradigms=()):
+        """
+        Args:
+            entries: (word, lemma id, paradigm id) tuples, in lexicon order
+            lemmas: lemma strings, in lemma id order
+            paradigms: paradigm strings, in paradigm id order
+        """
+        from demorphy.tagset import Paradigm
+        self.entries = list(entries)
+        self.lemma_list = list(lemmas)
+        self.paradigm_table = [Paradigm(paradigm_str) for paradigm_str in paradigms]
+
+    def iter_lexicon_ids(self, prefix=u""):
+        return iter(self.entries)
+
+    def lookup_lemma(self, lemma_id):
+        return self.lemma_list[lemma_id]
+
+
+@pytest.fixture(scope='session')
+def lexicon_stub():
+    return LexiconStub
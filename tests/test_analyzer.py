@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy import Analyzer
+
+
+class TestLazyLoading:
+    def test_lazy_init(self):
+        analyzer = Analyzer(char_subs_allowed=True, lazy=True)
+        assert analyzer.dictionary is None
+        assert analyzer.is_known(u"roter")
+        assert analyzer.dictionary is not None
+
+    def test_warmup(self):
+        analyzer = Analyzer(char_subs_allowed=True, lazy=True)
+        assert analyzer.warmup() is analyzer
+        dictionary = analyzer.dictionary
+        analyzer.warmup()
+        assert analyzer.dictionary is dictionary
+
+
+class TestResultInterning:
+    def test_same_objects(self, analyzer):
+        first = analyzer.analyze(u"Flughafen")
+        second = analyzer.analyze(u"Flughafen")
+        assert all(r1 is r2 for r1, r2 in zip(first, second))
+
+    def test_bounded(self):
+        analyzer = Analyzer(char_subs_allowed=True, result_pool_size=1)
+        analyzer.analyze(u"Flughafen")
+        analyzer.analyze(u"roter")
+        assert len(analyzer._result_pool) == 1
+
+    def test_disabled(self):
+        analyzer = Analyzer(char_subs_allowed=True, result_pool_size=0)
+        first = analyzer.analyze(u"roter")
+        second = analyzer.analyze(u"roter")
+        assert first[0] is not second[0]
+
+
+class TestAnalyzeMany:
+    def test_input_order(self, analyzer):
+        words = [u"roter", u"Flughafen", u"roter", u"gegangen"]
+        batch = analyzer.analyze_many(words)
+
+        assert batch.n_tokens == 4
+        assert batch.n_types == 3
+        assert [[str(r) for r in analyses] for analyses in batch] == [[str(r) for r in analyzer.analyze(w)] for w in words]
+
+    def test_shared_types(self, analyzer):
+        batch = analyzer.analyze_many(iter([u"roter", u"Flughafen", u"roter"]))
+        assert batch[0] is batch[2]
+        assert len(batch.tolist()) == 3
+
+    def test_slice(self, analyzer):
+        batch = analyzer.analyze_many([u"roter", u"Flughafen", u"roter", u"gegangen"])
+        assert batch[1:3] == [batch[1], batch[2]]
+        assert batch[1:3][1] is batch[0]
+        assert batch[::-1] == list(batch)[::-1]
+        assert batch[5:] == []
+
+
+class TestSpellingVariants:
+    def test_multi_char(self, analyzer):
+        assert u"Straße" in [r.lemma for r in analyzer.analyze(u"Strasse")]
+        assert u"Fuß" in [r.lemma for r in analyzer.analyze(u"Fuss")]
+
+    def test_compile(self):
+        from demorphy.morph_dict import Dictionary
+        substitutes = Dictionary.compile_spelling_substitutes({u"s": u"z", u"ss": u"ß", u"ue": u"ü"})
+        assert substitutes[u"s"] == ((u"ss", u"ß"), (u"s", u"z"))
+        assert substitutes[u"u"] == ((u"ue", u"ü"),)
+
+
+class TestCaseFolding:
+    def test_lowercased_noun(self):
+        analyzer = Analyzer(char_subs_allowed=True, case_fold=True)
+        form, results = analyzer.analyze_with_form(u"flughafen")
+        assert form == u"Flughafen"
+        assert all(not r.guesser for r in results)
+        assert analyzer.is_known(u"flughafen")
+
+    def test_swap_first_case(self):
+        assert Analyzer.swap_first_case(u"haus") == u"Haus"
+        assert Analyzer.swap_first_case(u"Der") == u"der"
+        assert Analyzer.swap_first_case(u"ärger") == u"Ärger"
+
+
+class TestRequiredTags:
+    def test_filter(self, analyzer):
+        results = analyzer.analyze(u"Flughafen", require={u"nom"})
+        assert results
+        assert all(u"nom" in r for r in results)
+        assert len(results) < len(analyzer.analyze(u"Flughafen"))
+
+    def test_no_match(self, analyzer):
+        assert analyzer.analyze(u"Flughafen", require={u"V"}) == []
+
+    def test_guesser(self, analyzer):
+        assert all(u"V" in r for r in analyzer.analyze(u"googelte", require=[u"V"]))
+
+
+class TestRawResults:
+    def test_lexicon_ids(self, analyzer):
+        raw = analyzer.analyze_raw(u"Flughafen")
+        assert all(isinstance(lemma_id, int) and isinstance(paradigm_id, int) for (lemma_id, paradigm_id) in raw)
+
+    def test_hydrate(self, analyzer):
+        for word in (u"Flughafen", u"googelte"):
+            assert [str(analyzer.hydrate(raw_result)) for raw_result in analyzer.analyze_raw(word)] == [str(r) for r in analyzer.analyze(word)]
+
+    def test_guess_lemma(self, analyzer):
+        assert all(lemma == u"googelen" for (lemma, paradigm) in analyzer.analyze_raw(u"googelte"))
+
+
+class TestLemmatize:
+    def test_same_as_analyze(self, analyzer):
+        for word in (u"gegangen", u"Flughafen", u"Strasse", u"googelte"):
+            assert sorted(analyzer.lemmatize(word)) == sorted(set(r.lemma for r in analyzer.analyze(word)))
+
+    def test_many(self, analyzer):
+        lemmas = analyzer.lemmatize_many([u"gehe", u"Flughafen", u"gehe"])
+        assert lemmas[0] == [u"gehen"]
+        assert lemmas[0] is lemmas[2]
+
+
+class TestThreadSafety:
+    WORDS = [u"Flughafen", u"gegangen", u"roter", u"Strasse", u"googelte", u"Bundesdatenschutzbeauftragter"] * 200
+
+    def test_concurrent_analyze(self):
+        from concurrent.futures import ThreadPoolExecutor
+        analyzer = Analyzer(char_subs_allowed=True, result_pool_size=10)
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda word: [str(r) for r in analyzer.analyze(word)], self.WORDS))
+        assert results == [[str(r) for r in analyzer.analyze(word)] for word in self.WORDS]
+
+    def test_concurrent_warmup(self):
+        from concurrent.futures import ThreadPoolExecutor
+        analyzer = Analyzer(char_subs_allowed=True, lazy=True)
+        with ThreadPoolExecutor(8) as executor:
+            dictionaries = list(executor.map(lambda x: analyzer.warmup().dictionary, range(32)))
+        assert all(dictionary is dictionaries[0] for dictionary in dictionaries)
+
+    def test_pools_per_thread(self):
+        import threading
+        analyzer = Analyzer(char_subs_allowed=True)
+        pools = []
+        thread = threading.Thread(target=lambda: pools.append(analyzer._result_pool))
+        thread.start()
+        thread.join()
+        assert pools[0] is not analyzer._result_pool
+
+
+class TestAnalysisCache:
+    def test_cache_info(self):
+        analyzer = Analyzer(char_subs_allowed=True, cache=1)
+        first = analyzer.analyze(u"Flughafen")
+        assert [str(r) for r in analyzer.analyze(u"Flughafen")] == [str(r) for r in first]
+        analyzer.analyze(u"roter")
+        info = analyzer.cache_info()
+        assert (info.hits, info.misses, info.evictions, info.maxsize, info.currsize) == (1, 2, 1, 1, 1)
+
+    def test_methods(self):
+        analyzer = Analyzer(char_subs_allowed=True, cache="unlim")
+        for x in range(2):
+            analyzer.is_known(u"roter")
+            analyzer.lemmatize(u"gegangen")
+            analyzer.analyze(u"Flughafen", require={u"nom"})
+        assert analyzer.cache_info().hits == 3
+        assert analyzer.cache_info().maxsize is None
+
+    def test_no_cache(self):
+        analyzer = Analyzer(char_subs_allowed=True)
+        analyzer.analyze(u"roter")
+        assert analyzer.cache_info().currsize == 0
+
+
+class TestPersistentCache:
+    def test_second_run(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        with Analyzer(char_subs_allowed=True, persistent_cache=path) as analyzer:
+            first = [str(r) for r in analyzer.analyze(u"Flughafen")]
+            guesses = [str(r) for r in analyzer.analyze(u"googelte")]
+            lemmas = analyzer.lemmatize(u"gegangen")
+
+        analyzer = Analyzer(char_subs_allowed=True, persistent_cache=path)
+        analyzer._lookup_raw = None
+        assert [str(r) for r in analyzer.analyze(u"Flughafen")] == first
+        assert [str(r) for r in analyzer.analyze(u"googelte")] == guesses
+        assert analyzer.lemmatize(u"gegangen") == lemmas
+        analyzer.close()
+
+    def test_separators(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        words = [u"googel\nte", u"googel\tte", u"googel\\te", u"\0fingerprint"]
+        with Analyzer(char_subs_allowed=True, persistent_cache=path) as analyzer:
+            guesses = [[(r.lemma, str(r)) for r in analyzer.analyze(word)] for word in words]
+        assert guesses[0][0][0] == u"googel\nen"
+
+        with Analyzer(char_subs_allowed=True, persistent_cache=path) as analyzer:
+            analyzer._lookup_raw = None
+            assert [[(r.lemma, str(r)) for r in analyzer.analyze(word)] for word in words] == guesses
+
+    def test_settings_invalidate(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        with Analyzer(char_subs_allowed=True, persistent_cache=path) as analyzer:
+            analyzer.analyze(u"Flughafen")
+        with Analyzer(char_subs_allowed=True, compounds=False, persistent_cache=path) as analyzer:
+            assert analyzer._store.get(u"Flughafen") is None
+
+
+class TestCacheWarmup:
+    def test_frequency_list(self, tmpdir):
+        path = tmpdir.join("frequencies.txt")
+        path.write_text(u"# rank word count\n1 der 100\n2 Flughafen 50\n\n3 gehen 10\n", encoding="utf-8")
+        analyzer = Analyzer(char_subs_allowed=True, cache=200)
+        assert analyzer.cache_warmup(str(path), top=2, methods=("analyze", "lemmatize")) == 2
+        analyzer.analyze(u"Flughafen")
+        analyzer.lemmatize(u"der")
+        analyzer.analyze(u"gehen")
+        info = analyzer.cache_info()
+        assert (info.hits, info.currsize) == (2, 5)
+
+    def test_bundled_list(self):
+        analyzer = Analyzer(char_subs_allowed=True, cache=10)
+        assert analyzer.cache_warmup() == 10
+        assert analyzer.cache_info().currsize == 10
+        with pytest.raises(ValueError):
+            analyzer.cache_warmup(methods=("inflect",))
+        with pytest.raises(ValueError):
+            Analyzer(char_subs_allowed=True).cache_warmup()
+
+    def test_snapshot(self, tmpdir):
+        path = str(tmpdir.join("snapshot.txt"))
+        analyzer = Analyzer(char_subs_allowed=True, cache=200)
+        analyzer.analyze(u"Flughafen", require={u"nom"})
+        analyzer.lemmatize(u"gegangen")
+        analyzer.is_known(u"roter")
+        assert analyzer.cache_dump(path) == 3
+
+        restored = Analyzer(char_subs_allowed=True, cache=200)
+        assert restored.cache_restore(path) == 3
+        assert [str(r) for r in restored.analyze(u"Flughafen", require={u"nom"})] == [str(r) for r in analyzer.analyze(u"Flughafen", require={u"nom"})]
+        restored.lemmatize(u"gegangen")
+        restored.is_known(u"roter")
+        assert restored.cache_info().hits == 3
+
+    def test_restore_smaller(self, tmpdir):
+        path = str(tmpdir.join("snapshot.txt"))
+        analyzer = Analyzer(char_subs_allowed=True, cache=512)
+        words = [u"Wortgebilde%d" % i for i in range(512)]
+        for word in words:
+            analyzer.is_known(word)
+        for word in words[100:164]:
+            analyzer.is_known(word)
+        analyzer.cache_dump(path)
+
+        restored = Analyzer(char_subs_allowed=True, cache=128)
+        assert restored.cache_restore(path) == 128
+        assert all((u"is_known", word) in restored._cache for word in words[100:164])
+
+    def test_not_snapshot(self, tmpdir):
+        path = tmpdir.join("words.txt")
+        path.write_text(u"Flughafen\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            Analyzer(char_subs_allowed=True, cache=200).cache_restore(str(path))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.morph_dict.bloom_filter import BloomFilter
+
+
+WORDS = [u"Straße", u"Müller", u"Häuser", u"gehen", u"schön", u"Queue"]
+
+
+@pytest.fixture(scope="module")
+def bloom_filter():
+    return BloomFilter.build(WORDS, error_rate=0.001)
+
+
+class TestBloomFilter:
+    def test_fold(self):
+        assert BloomFilter.fold(u"Straße") == BloomFilter.fold(u"strasse")
+        assert BloomFilter.fold(u"Müller") == BloomFilter.fold(u"Mueller") == BloomFilter.fold(u"muller")
+        assert BloomFilter.fold(u"üe") == BloomFilter.fold(u"uee")
+
+    def test_spelling_variants(self, bloom_filter):
+        for word in (u"Strasse", u"Mueller", u"Haeuser", u"Hauser", u"Gehen", u"schoen", u"Queü"):
+            assert word in bloom_filter
+
+    def test_misses(self, bloom_filter):
+        assert sum(1 for word in (u"#gehen", u"gehen.com", u"gehne", u"Strase", u"Müler") if word in bloom_filter) <= 1
+
+    def test_save_load(self, bloom_filter, tmpdir):
+        path = str(tmpdir.join("words.bloom"))
+        bloom_filter.save(path)
+        loaded = BloomFilter().load(path)
+        assert loaded.num_hashes == bloom_filter.num_hashes
+        assert loaded.nbytes == bloom_filter.nbytes
+        assert all(word in loaded for word in WORDS)
+
+    def test_old_format(self, tmpdir):
+        path = tmpdir.join("words.bloom")
+        path.write_binary(b"DMBF" + b"\0" * 20)
+        with pytest.raises(ValueError):
+            BloomFilter().load(str(path))
+
+    def test_false_positive_rate(self, bloom_filter):
+        assert 0 < bloom_filter.false_positive_rate < 0.01
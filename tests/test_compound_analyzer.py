@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.compound_analyzer import CompoundAnalyzer
+from demorphy.dafsa import DAWG
+
+
+class DictionaryStub(object):
+    """Just enough of Dictionary for splitting compounds"""
+
+    def __init__(self, words):
+        self.dafsa = DAWG(words)
+
+    def find_prefix_words(self, word):
+        return self.dafsa.prefixes(word)
+
+
+@pytest.fixture(scope="module")
+def compound_analyzer():
+    return CompoundAnalyzer(DictionaryStub([u"Bund", u"Daten", u"Schutz", u"Beauftragter", u"Haus", u"rot", u"hell"]))
+
+
+class TestCompoundAnalyzer:
+    def test_linking_elements(self, compound_analyzer):
+        assert compound_analyzer.split(u"Bundesdatenschutzbeauftragter") == (u"Bundesdatenschutz", u"Beauftragter")
+
+    def test_adjective_head(self, compound_analyzer):
+        assert compound_analyzer.split(u"hellrot") == (u"hell", u"rot")
+
+    def test_no_split(self, compound_analyzer):
+        assert compound_analyzer.split(u"Hauxschutz") is None
+        assert compound_analyzer.split(u"Haus") is None
+        assert compound_analyzer.split(u"Haus" * 20) is None
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.cache import CountingCache, CacheInfo
+
+
+class TestCountingCache:
+    def test_counters(self):
+        cache = CountingCache(2)
+        assert cache.get(u"a") is None
+        cache[u"a"] = 1
+        assert cache.get(u"a") == 1
+        assert cache.cache_info() == CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+
+    def test_evictions(self):
+        cache = CountingCache(2)
+        for key in (u"a", u"b", u"c"):
+            cache[key] = key
+        assert u"a" not in cache
+        assert cache.cache_info().evictions == 1
+        assert len(cache) == 2
+
+    def test_unbounded(self):
+        cache = CountingCache()
+        for i in range(1000):
+            cache[i] = i
+        assert cache.cache_info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=None, currsize=1000)
+
+    def test_keys(self):
+        cache = CountingCache(2)
+        cache[u"a"] = 1
+        cache[u"b"] = 2
+        cache.get(u"a")
+        assert cache.keys() == [u"a", u"b"]
+        cache = CountingCache()
+        cache[u"a"] = 1
+        cache[u"b"] = 2
+        cache.get(u"a")
+        assert cache.keys() == [u"a", u"b"]
+
+    def test_keys_across_shards(self):
+        cache = CountingCache(512)
+        for i in range(512):
+            cache[i] = i
+        touched = list(range(100, 164))
+        for i in touched:
+            cache.get(i)
+        assert cache.keys()[:64] == touched[::-1]
+
+    def test_clear(self):
+        cache = CountingCache(2)
+        cache[u"a"] = 1
+        cache.get(u"a")
+        cache.cache_clear()
+        assert cache.cache_info() == CacheInfo(0, 0, 0, 2, 0)
+
+    def test_size(self):
+        with pytest.raises(ValueError):
+            CountingCache(0)
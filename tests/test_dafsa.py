@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import sys
+
+import pytest
+
+from demorphy.dafsa import LexiconDawg, MappedLexiconDawg
+
+pytest.importorskip("dawg_python")
+pytestmark = pytest.mark.skipif(sys.version_info[0] < 3, reason="memory mapped dictionaries need Python 3")
+
+LEXICON = [
+    (u"Haus", (0, 10)), (u"Hauses", (0, 11)), (u"Häuser", (0, 12)), (u"Häusern", (0, 13)),
+    (u"gehen", (1, 20)), (u"gehe", (1, 21)), (u"gegangen", (1, 22)), (u"gegangen", (2, 30)),
+    (u"Straße", (3, 40)), (u"groß", (4, 50)), (u"große", (4, 51)),
+]
+
+
+@pytest.fixture(scope="module")
+def dawgs(tmpdir_factory):
+    path = str(tmpdir_factory.mktemp("dafsa").join("words.dg"))
+    LexiconDawg(LEXICON).save(path)
+    return LexiconDawg().load(path), MappedLexiconDawg().load(path)
+
+
+class TestMappedLexiconDawg:
+    WORDS = [u"Haus", u"Häuser", u"gegangen", u"Straße", u"Strasse", u"Hau", u"", u"Maus"]
+
+    def test_get(self, dawgs):
+        dawg, mapped = dawgs
+        for word in self.WORDS:
+            assert mapped.get(word, []) == dawg.get(word, [])
+            assert (word in mapped) == (word in dawg)
+
+    def test_similar_keys(self, dawgs):
+        dawg, mapped = dawgs
+        substitutes = {u"a": u"ä", u"o": u"ö", u"u": u"ü"}
+        dawg_replaces, mapped_replaces = dawg.compile_replaces(substitutes), mapped.compile_replaces(substitutes)
+        for word in [u"Hauser", u"Hausern", u"Haus", u"gross", u"Maus"]:
+            assert mapped.similar_keys(word, mapped_replaces) == dawg.similar_keys(word, dawg_replaces)
+
+    def test_prefixes(self, dawgs):
+        dawg, mapped = dawgs
+        for word in [u"Hauses", u"große", u"gegangenen", u"Maus"]:
+            assert mapped.prefixes(word) == dawg.prefixes(word)
+
+    def test_iteritems(self, dawgs):
+        dawg, mapped = dawgs
+        for prefix in [u"", u"Hau", u"ge", u"x"]:
+            assert list(mapped.iteritems(prefix)) == list(dawg.iteritems(prefix))
+
+    def test_has_keys_with_prefix(self, dawgs):
+        dawg, mapped = dawgs
+        for prefix in [u"", u"H", u"Häu", u"Straß", u"Stras", u"x"]:
+            assert mapped.has_keys_with_prefix(prefix) == dawg.has_keys_with_prefix(prefix)
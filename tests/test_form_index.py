@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.morph_dict.form_index import FormIndex
+
+
+@pytest.fixture
+def lexicon(lexicon_stub):
+    return lexicon_stub(
+        [(u"Haus", 0, 10), (u"Hauses", 0, 11), (u"Häuser", 0, 12), (u"gehe", 1, 20), (u"gehen", 1, 21)],
+        lemmas=[u"Haus", u"gehen"],
+    )
+
+
+class TestFormIndex:
+    def test_forms(self, lexicon):
+        index = FormIndex.build(lexicon)
+        assert index.forms(u"Haus") == [(u"Haus", 10), (u"Hauses", 11), (u"Häuser", 12)]
+        assert index.forms(u"gehen") == [(u"gehe", 20), (u"gehen", 21)]
+
+    def test_unknown_lemma(self, lexicon):
+        index = FormIndex.build(lexicon)
+        assert index.forms(u"Hauses") == []
+
+    def test_save_load(self, tmpdir, lexicon):
+        path = str(tmpdir.join("forms.dg"))
+        FormIndex.build(lexicon).save(path)
+        assert FormIndex().load(path).forms(u"gehen") == [(u"gehe", 20), (u"gehen", 21)]
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import sys
+import types
+
+import pytest
+
+from demorphy.morph_dict.lemma_table import LemmaTable
+from demorphy.morph_dict.load_dicts import load_lemmas
+
+
+class TestLemmaTable:
+    def test_lookup(self, tmpdir):
+        path = str(tmpdir.join("lemmas.dat"))
+        LemmaTable.build([u"gehen", u"", u"Straße", u"rot"], path)
+        table = LemmaTable().load(path)
+
+        assert len(table) == 4
+        assert table[0] == u"gehen"
+        assert table[1] == u""
+        assert table[2] == u"Straße"
+        assert list(table) == [u"gehen", u"", u"Straße", u"rot"]
+
+    def test_out_of_range(self, tmpdir):
+        path = str(tmpdir.join("lemmas.dat"))
+        LemmaTable.build([u"gehen"], path)
+        table = LemmaTable().load(path)
+
+        with pytest.raises(IndexError):
+            table[1]
+
+    def test_not_a_table(self, tmpdir):
+        path = str(tmpdir.join("lemmas.dat"))
+        tmpdir.join("lemmas.dat").write("gehen")
+
+        with pytest.raises(ValueError):
+            LemmaTable().load(path)
+
+
+class TestLoadLemmas:
+    @pytest.fixture
+    def lemma_module(self, monkeypatch):
+        module = types.ModuleType(str("demorphy.data.lemmas"))
+        module.lemmas = [u"gehen", u"Straße"]
+        monkeypatch.setitem(sys.modules, "demorphy.data.lemmas", module)
+        return module
+
+    def test_build_from_module(self, tmpdir, lemma_module):
+        lemmas = load_lemmas(str(tmpdir))
+        assert isinstance(lemmas, LemmaTable)
+        assert list(lemmas) == [u"gehen", u"Straße"]
+        assert tmpdir.join("lemmas.dat").check()
+
+    def test_read_only_folder(self, tmpdir, lemma_module):
+        assert load_lemmas(str(tmpdir.join("missing"))) == [u"gehen", u"Straße"]
+
+    def test_no_lemmas(self, tmpdir, monkeypatch):
+        monkeypatch.setitem(sys.modules, "demorphy.data.lemmas", None)
+        with pytest.raises(IOError):
+            load_lemmas(str(tmpdir))
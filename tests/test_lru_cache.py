@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+
+from demorphy.cache import lrucache, lrudecorator
+from demorphy.cache.pylru import lruwrap
+
+
+class TestLRUCache:
+    def test_mapping(self):
+        cache = lrucache(10)
+        cache[u"a"] = 1
+        cache.update({u"b": 2})
+        assert cache[u"a"] == 1
+        assert cache.get(u"c") is None
+        assert cache.get(u"c", 0) == 0
+        assert u"b" in cache
+        assert len(cache) == 2
+        del cache[u"a"]
+        assert u"a" not in cache
+        with pytest.raises(KeyError):
+            cache[u"a"]
+
+    def test_order(self):
+        cache = lrucache(3)
+        for key in u"abc":
+            cache[key] = key.upper()
+        cache[u"a"]
+        cache.peek(u"b")
+        assert list(cache) == [u"a", u"c", u"b"]
+        assert list(cache.keys()) == [u"a", u"c", u"b"]
+        assert list(cache.values()) == [u"A", u"C", u"B"]
+        assert list(cache.items()) == [(u"a", u"A"), (u"c", u"C"), (u"b", u"B")]
+
+    def test_eviction(self):
+        evicted = []
+        cache = lrucache(2, callback=lambda key, value: evicted.append((key, value)))
+        cache[u"a"] = 1
+        cache[u"b"] = 2
+        cache.get(u"a")
+        cache[u"c"] = 3
+        assert evicted == [(u"b", 2)]
+        assert list(cache) == [u"c", u"a"]
+
+        cache[u"a"] = 4
+        assert evicted == [(u"b", 2)]
+        assert list(cache.items()) == [(u"a", 4), (u"c", 3)]
+
+    def test_resize(self):
+        evicted = []
+        cache = lrucache(4, callback=lambda key, value: evicted.append(key))
+        for i in range(4):
+            cache[i] = i
+        assert cache.size() == 4
+        assert cache.size(2) == 2
+        assert evicted == [0, 1]
+        assert list(cache) == [3, 2]
+        cache.size(3)
+        cache[4] = 4
+        assert len(cache) == 3
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size() == 3
+
+    def test_writeback(self):
+        store = {}
+        cache = lruwrap(store, 1, writeback=True)
+        cache[u"a"] = 1
+        assert store == {}
+        cache[u"b"] = 2
+        assert store == {u"a": 1}
+        cache.sync()
+        assert store == {u"a": 1, u"b": 2}
+
+    def test_decorator(self):
+        calls = []
+
+        @lrudecorator(2)
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        assert [square(2), square(3), square(2)] == [4, 9, 4]
+        assert calls == [2, 3]
+        square(4)
+        square(3)
+        assert calls == [2, 3, 4, 3]
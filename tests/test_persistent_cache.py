@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import threading
+
+import pytest
+
+from demorphy.cache import PersistentCache
+from demorphy.cache import persistent_cache
+from demorphy.cache.persistent_cache import dump_record, load_record
+
+
+class TestRecords:
+    def test_lexicon(self):
+        record = dump_record(u"Straße", [(3, 120), (3, 121)])
+        assert len(record) == 1 + len(u"Straße".encode("utf-8")) + 1 + 16
+        assert load_record(record) == (u"Straße", ((3, 120), (3, 121)))
+
+    def test_guesses(self):
+        guesses = [(u"googeln", u"V,1per,sing,past,ind"), (u"Bundesdatenschutzbeauftragter", 77)]
+        assert load_record(dump_record(None, guesses)) == (None, tuple(guesses))
+
+    def test_separators(self):
+        guesses = [(u"googel\nten", u"V,1per,sing,past,ind"), (u"a\tb\\t\0", 77)]
+        assert load_record(dump_record(None, guesses)) == (None, tuple(guesses))
+
+    def test_empty(self):
+        assert load_record(dump_record(None, [])) == (None, ())
+        assert load_record(dump_record(u"Haus", [])) == (u"Haus", ())
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            load_record(b"X")
+        with pytest.raises(ValueError):
+            load_record(b"Ggoogeln")
+        with pytest.raises(ValueError):
+            load_record(b"Ggoogel\\xn\t77")
+        with pytest.raises(ValueError):
+            load_record(b"LHaus\0\1\2")
+
+
+class TestPersistentCache:
+    def test_reopen(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        with PersistentCache(path, u"dict1", size=1) as cache:
+            cache[u"Haus"] = (u"Haus", ((1, 2),))
+            cache[PersistentCache.make_key(u"Haus", {u"nom", u"NN"})] = (u"Haus", ())
+            cache[u"googelte"] = (None, ((u"googeln", u"V,1per,sing,past,ind"),))
+
+        with PersistentCache(path, u"dict1") as cache:
+            assert cache.get(u"Haus") == (u"Haus", ((1, 2),))
+            assert cache.get(u"Haus\tNN,nom") == (u"Haus", ())
+            assert cache.get(u"googelte")[1] == ((u"googeln", u"V,1per,sing,past,ind"),)
+            assert cache.get(u"Maus") is None
+
+    def test_keys(self):
+        assert PersistentCache.make_key(u"Haus") == u"Haus"
+        assert PersistentCache.make_key(u"Haus\tNN") != PersistentCache.make_key(u"Haus", {u"NN"})
+        assert PersistentCache.make_key(u"Haus\\tNN") != PersistentCache.make_key(u"Haus\tNN")
+        assert not PersistentCache.make_key(u"\0fingerprint").startswith(u"\0")
+
+    def test_malformed(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        with PersistentCache(path, u"dict1") as cache:
+            cache[u"Haus"] = (u"Haus", ((1, 2),))
+            cache.sync()
+            cache.db[b"Maus"] = b"X"
+        with PersistentCache(path, u"dict1") as cache:
+            assert cache.get(u"Maus") is None
+            assert cache.get(u"Haus") == (u"Haus", ((1, 2),))
+
+    def test_invalidate(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        with PersistentCache(path, u"dict1") as cache:
+            cache[u"Haus"] = (u"Haus", ((1, 2),))
+        with PersistentCache(path, u"dict2") as cache:
+            assert cache.get(u"Haus") is None
+
+    def test_upgrade(self, tmpdir, monkeypatch):
+        path = str(tmpdir.join("analyses"))
+        with PersistentCache(path, u"dict1") as cache:
+            cache[u"Haus"] = (u"Haus", ((1, 2),))
+        monkeypatch.setattr(persistent_cache, "__version__", u"0.0")
+        with PersistentCache(path, u"dict1") as cache:
+            assert cache.get(u"Haus") is None
+
+    def test_closed(self, tmpdir):
+        cache = PersistentCache(str(tmpdir.join("analyses")), u"dict1")
+        cache.close()
+        cache.close()
+        cache[u"Haus"] = (u"Haus", ())
+        assert cache.get(u"Haus") is None
+
+    def test_threads(self, tmpdir):
+        path = str(tmpdir.join("analyses"))
+        errors = []
+
+        def _work(offset):
+            try:
+                for i in range(200):
+                    key = u"Wort%d" % ((i * 7 + offset) % 300)
+                    record = cache.get(key)
+                    if record is None:
+                        cache[key] = (key, ((i, offset),))
+                    elif record[0] != key:
+                        errors.append(key)
+            except Exception as e:
+                errors.append(e)
+
+        with PersistentCache(path, u"dict1", size=64, shards=4) as cache:
+            threads = [threading.Thread(target=_work, args=(offset,)) for offset in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert errors == []
+
+        with PersistentCache(path, u"dict1") as cache:
+            assert all(cache.get(u"Wort%d" % i)[0] == u"Wort%d" % i for i in range(300))
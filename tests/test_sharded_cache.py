@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import threading
+
+import pytest
+
+from demorphy.cache import shardedlrucache, shardedlrudecorator
+
+
+class TestShardedLRUCache:
+    def test_mapping(self):
+        cache = shardedlrucache(100, shards=4)
+        cache[u"a"] = 1
+        assert cache[u"a"] == 1
+        assert cache.get(u"b") is None
+        assert u"a" in cache
+        del cache[u"a"]
+        assert u"a" not in cache
+        with pytest.raises(KeyError):
+            cache[u"a"]
+
+    def test_size(self):
+        cache = shardedlrucache(10, shards=4)
+        assert cache.size() == 10
+        assert sorted(c.size() for lock, c in cache._shards) == [2, 2, 3, 3]
+        for i in range(100):
+            cache[i] = i
+        assert len(cache) <= 10
+        assert cache.get(99) == 99
+        assert cache.size(7) == 7
+        assert len(cache) <= 7
+        assert shardedlrucache(3, shards=16).size() == 3
+
+    def test_shard_lru(self):
+        cache = shardedlrucache(2, shards=1)
+        cache[u"a"] = 1
+        cache[u"b"] = 2
+        cache[u"a"]
+        cache[u"c"] = 3
+        assert sorted(cache.keys()) == [u"a", u"c"]
+
+    def test_threads(self):
+        cache = shardedlrucache(64, shards=4)
+
+        def _work(offset):
+            for i in range(5000):
+                key = (offset + i) % 200
+                value = cache.get(key)
+                assert value is None or value == key
+                cache[key] = key
+
+        threads = [threading.Thread(target=_work, args=(n * 7,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(cache) <= cache.size()
+        assert all(key == value for key, value in cache.items())
+
+    def test_decorator(self):
+        calls = []
+
+        @shardedlrudecorator(10)
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        assert square(3) == 9
+        assert square(3) == 9
+        assert calls == [3]
@@ -18,4 +18,6 @@ class TestAnalogyLookup:
         res = SuffixAnalyzer.guess_word_by_suffix(word)
         assert res == result
 
-
+    def test_longest_suffix(self):
+        assert SuffixAnalyzer.guess_word_by_suffix(u"schreibtest") == (u"schreiben", ["V,2per,sing,past,ind", "V,2per,sing,past,subj"])
+        assert SuffixAnalyzer.guess_word_by_suffix(u"gegoogelten")[0] == u"gegoogelt"
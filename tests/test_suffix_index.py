@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.morph_dict.suffix_index import SuffixIndex
+
+
+@pytest.fixture
+def lexicon(lexicon_stub):
+    return lexicon_stub(
+        [(u"Zeitung", 0, 0), (u"Zeitungen", 0, 1), (u"Rechnung", 1, 0), (u"Rechnungen", 1, 1), (u"die", 2, 2)],
+        lemmas=[u"Zeitung", u"Rechnung", u"die"],
+        paradigms=["NN,fem,nom,sing", "NN,fem,nom,plu", "ART,fem,nom,sing,<def>,strong"],
+    )
+
+
+class TestSuffixIndex:
+    def test_lemma_rule(self):
+        assert SuffixIndex.lemma_rule(u"Hauses", u"Haus") == (2, u"")
+        assert SuffixIndex.lemma_rule(u"gehe", u"gehen") == (0, u"n")
+        assert SuffixIndex.lemma_rule(u"Häuser", u"Haus") == (5, u"aus")
+
+    def test_guess(self, lexicon):
+        index = SuffixIndex.build(lexicon)
+        assert index.guess(u"Wohnungen") == [(u"Wohnung", 1)]
+        assert index.guess(u"Wohnung") == [(u"Wohnung", 0)]
+
+    def test_closed_classes_skipped(self, lexicon):
+        index = SuffixIndex.build(lexicon, min_count=1)
+        assert all(para_id != 2 for (lemma, para_id) in index.guess(u"sie"))
+
+    def test_save_load(self, tmpdir, lexicon):
+        path = str(tmpdir.join("suffixes.dg"))
+        SuffixIndex.build(lexicon).save(path)
+        assert SuffixIndex().load(path).guess(u"Wohnungen") == [(u"Wohnung", 1)]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.morph_dict.tag_index import TagIndex
+
+
+@pytest.fixture(scope="module")
+def tag_index(tmpdir_factory, lexicon_stub):
+    lexicon = lexicon_stub(
+        [(u"Rechnung", 0, 0), (u"Rechnungen", 0, 1), (u"Zeitung", 1, 0), (u"Zeitungen", 1, 1),
+         (u"Zeitungen", 2, 1), (u"Zeitungen", 3, 2)],
+        paradigms=["NN,fem,nom,sing", "NN,fem,nom,plu", "V,inf"],
+    )
+    path = str(tmpdir_factory.mktemp("tag_index"))
+    TagIndex.build(lexicon, path)
+    return TagIndex().load(path)
+
+
+class TestTagIndex:
+    def test_word_ids(self, tag_index):
+        assert list(tag_index.word_ids(0)) == [0, 2]
+        assert list(tag_index.word_ids(1)) == [1, 3]
+        assert list(tag_index.word_ids(2)) == [3]
+
+    def test_words(self, tag_index):
+        assert [tag_index.word(word_id) for word_id in tag_index.word_ids(1)] == [u"Rechnungen", u"Zeitungen"]
+
+    def test_out_of_range(self, tag_index):
+        with pytest.raises(IndexError):
+            tag_index.word_ids(3)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+import pytest
+
+from demorphy.data import paradigms
+from demorphy.tagset import Paradigm, ParsedResult
+
+
+class TestParsedResult:
+    @pytest.mark.parametrize("paradigm_str, expected", [
+        ("NN,masc,nom,sing",
+         "{'CASE': 'nom', 'CATEGORY': 'NN', 'GENDER': 'masc', 'LEMMA': 'Haus', 'NUMERUS': 'sing', 'PTB_TAG': 'NN', 'STTS_TAG': 'NN'}"),
+        ("ADJ,comp,<adv>",
+         "{'ADDITIONAL_ATTRIBUTES': '<adv>', 'CATEGORY': 'ADJ', 'DEGREE': 'comp', 'LEMMA': 'Haus', 'PTB_TAG': 'JJR', 'STTS_TAG': 'ADJD'}"),
+        ("V,1per,sing,past,ind",
+         "{'CATEGORY': 'V', 'LEMMA': 'Haus', 'MODE': 'ind', 'NUMERUS': 'sing', 'PERSON': '1per', 'PTB_TAG': 'V', 'STTS_TAG': 'V', 'TENSE': 'past'}"),
+        ("V,ppast,<aux>",
+         "{'ADDITIONAL_ATTRIBUTES': '<aux>', 'CATEGORY': 'V', 'LEMMA': 'Haus', 'PTB_TAG': 'V', 'STTS_TAG': 'VA', 'TENSE': 'ppast'}"),
+        ("ART,fem,nom,sing,<def>,strong",
+         "{'ADDITIONAL_ATTRIBUTES': '<def>', 'CASE': 'nom', 'CATEGORY': 'ART', 'GENDER': 'fem', 'LEMMA': 'Haus', 'NUMERUS': 'sing', "
+         "'PTB_TAG': 'DET', 'STARKE': 'strong', 'STTS_TAG': 'ART'}"),
+        ("PRP,<refl>,1per,acc,sing",
+         "{'ADDITIONAL_ATTRIBUTES': '<refl>', 'CASE': 'acc', 'CATEGORY': 'PRP', 'LEMMA': 'Haus', 'NUMERUS': 'sing', 'PERSON': '1per', "
+         "'PTB_TAG': 'PRON', 'STTS_TAG': 'PRP'}"),
+    ])
+    def test_str(self, paradigm_str, expected):
+        assert str(ParsedResult(paradigm_str, u"Haus")) == expected
+
+    def test_guesser(self):
+        result = ParsedResult("V,inf", u"gehen", guesser=True)
+        assert str(result) == "{'CATEGORY': 'V', 'GUESSER': True, 'INFLECTION': 'inf', 'LEMMA': 'gehen', 'PTB_TAG': 'VB', 'STTS_TAG': 'V'}"
+
+    def test_all_paradigms(self):
+        for paradigm_str in paradigms:
+            result = ParsedResult(Paradigm(paradigm_str), u"x")
+            keys = list(result)
+            assert keys == sorted(keys)
+            fields = result._instance_to_dict()
+            assert fields[u"LEMMA"] == u"x"
+            for key in keys:
+                if key != u"LEMMA":
+                    assert fields[key] and fields[key] == getattr(result, key.lower())
+
+    def test_iter(self):
+        result = ParsedResult("NN,masc,nom,sing", u"Haus")
+        assert list(result) == ["CASE", "CATEGORY", "GENDER", "LEMMA", "NUMERUS", "PTB_TAG", "STTS_TAG"]
+
+    def test_contains(self):
+        result = ParsedResult("ADJ,fem,acc,sing,comp", u"rot")
+        assert "ADJ" in result
+        assert "ADV" not in result
+        assert {"ADJ", "fem"} in result
+        assert frozenset(["acc", "sing"]) in result
+        assert {"ADJ", "plu"} not in result
+
+    def test_lazy_fields(self):
+        result = ParsedResult("NN,masc,nom,sing", u"Haus")
+        assert result._fields is None
+        assert result.case == "nom"
+        assert "NN" in result
+        assert result._fields is None
+        str(result)
+        assert result._fields is not None
+
+        result = ParsedResult("NN,masc,nom,sing", u"Haus")
+        list(result)
+        assert result._fields is not None